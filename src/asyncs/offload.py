@@ -0,0 +1,255 @@
+import asyncio
+import concurrent.futures
+import functools
+import os
+import time
+from typing import Any, Awaitable, Callable, Literal
+
+
+class OffloadPool:
+    """An executor pool running blocking functions off the event loop.
+
+    At most `max_workers` calls run at once; further calls wait in a queue
+    whose depth is reported by `stats()`.
+    Cancelling the awaiting task cancels the call if it is still queued.
+    Calls which raise, or which cannot be submitted to a broken
+    or shut down executor, are counted as failed.
+    A call already running in a thread cannot be interrupted;
+    its result is discarded, but it counts as running until it finishes.
+
+    Args:
+        kind (Literal["thread", "process"]): `"thread"` for blocking I/O,
+        `"process"` for CPU-bound functions.
+        functions run on a process pool must be picklable,
+        i.e. defined at the top level of a module.
+        max_workers (int): the max number of calls running at once
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+    ) -> None:
+        self.executor: concurrent.futures.Executor = \
+            concurrent.futures.ThreadPoolExecutor(max_workers) \
+            if kind == "thread" \
+            else concurrent.futures.ProcessPoolExecutor(max_workers)
+        self.max_workers = max_workers
+        # a semaphore is bound to the event loop where it is first used
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.max_waiting = 0
+
+    async def run(self, f: Callable, *args, **kwargs) -> Any:
+        "run `f(*args, **kwargs)` on the pool and await the result"
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        semaphore = self._semaphore
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            cf = self.executor.submit(functools.partial(f, *args, **kwargs))
+        except BaseException:
+            # e.g. `BrokenProcessPool` after a worker died,
+            # or `RuntimeError` after `shutdown()`
+            self.failed += 1
+            self._release(semaphore)
+            raise
+        # the slot is released when the call finishes, not when the task is
+        # cancelled; a running call cannot be stopped and still takes a worker
+        cf.add_done_callback(functools.partial(self._done, loop, semaphore))
+        try:
+            res = await asyncio.wrap_future(cf, loop=loop)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        return res
+
+    def _done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        semaphore: asyncio.Semaphore,
+        _: concurrent.futures.Future,
+    ) -> None:
+        # called on a worker thread or the executor's management thread
+        try:
+            loop.call_soon_threadsafe(self._release, semaphore)
+        except RuntimeError:
+            # the loop is closed; nothing awaits the semaphore any more
+            self._release(semaphore)
+
+    def _release(self, semaphore: asyncio.Semaphore) -> None:
+        self.running -= 1
+        semaphore.release()
+
+    def offload(self, f: Callable) -> Callable[..., Awaitable]:
+        """Modify the given blocking function `f`
+        to return an awaitable running `f` on the pool.
+
+        Use `run()` for process pools instead,
+        since the modified function cannot be pickled by name.
+        """
+        @functools.wraps(f)
+        async def wrapper(*args, **kwargs) -> Any:
+            return await self.run(f, *args, **kwargs)
+        return wrapper
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "max_waiting": self.max_waiting,
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+threads = OffloadPool("thread", max_workers=4)
+
+
+@threads.offload
+def blocking_sleep(secs: float) -> None:
+    time.sleep(secs)   # some task which could take much time on the process
+
+
+async def f():
+    print(f"f() started at {time.strftime('%X')}")
+    await blocking_sleep(5)
+    print(f"f() finished at {time.strftime('%X')}")
+
+
+async def g():
+    print(f"g() started at {time.strftime('%X')}")
+    await asyncio.sleep(3)  # some async task
+    print(f"g() finished at {time.strftime('%X')}")
+
+
+async def main():
+    task1 = asyncio.create_task(f())
+    task2 = asyncio.create_task(g())
+
+    print(f"main() started at {time.strftime('%X')}")
+
+    await task1
+    await task2
+
+    print(f"main() finished at {time.strftime('%X')}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+"""
+main() started at 12:20:20
+f() started at 12:20:20
+g() started at 12:20:20
+g() finished at 12:20:23
+f() finished at 12:20:25
+main() finished at 12:20:25
+
+f() took 5s
+g() took 3s
+main() took 5s, not 8s as `src/asyncs/sleep.py`
+
+`time.sleep(5)` runs on a thread of `threads`,
+so the event loop keeps running `g()` in the meantime.
+"""
+
+
+# concurrency limits, queue depth and cancellation
+async def limits():
+    tasks = [asyncio.create_task(blocking_sleep(0.5)) for _ in range(10)]
+    await asyncio.sleep(0.1)
+    print(threads.stats())
+    # {'waiting': 6, 'running': 4, 'completed': 1, 'cancelled': 0, 'failed': 0, 'max_waiting': 6} # noqa: E501
+
+    # cancelling queued calls; they never run
+    for task in tasks[4:]:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(threads.stats())
+    # {'waiting': 0, 'running': 0, 'completed': 5, 'cancelled': 6, 'failed': 0, 'max_waiting': 6} # noqa: E501
+
+    # cancelling a running call; it keeps its thread until it finishes
+    task = asyncio.create_task(blocking_sleep(0.5))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    print(threads.stats())
+    # {'waiting': 0, 'running': 1, 'completed': 5, 'cancelled': 7, 'failed': 0, 'max_waiting': 6} # noqa: E501
+    await asyncio.sleep(0.5)
+    print(threads.stats())
+    # {'waiting': 0, 'running': 0, 'completed': 5, 'cancelled': 7, 'failed': 0, 'max_waiting': 6} # noqa: E501
+
+if __name__ == "__main__":
+    asyncio.run(limits())
+    threads.shutdown()
+
+
+# CPU-bound functions on a process pool
+def fib(n: int) -> int:
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+async def cpu_bound():
+    processes = OffloadPool("process", max_workers=2)
+    results = await asyncio.gather(
+        *(processes.run(fib, n) for n in range(20, 25)))
+    print(results)
+    # [6765, 10946, 17711, 28657, 46368]
+    processes.shutdown()
+
+# workers of a process pool import this module again
+# unless they are forked (spawn on macOS and Windows)
+if __name__ == "__main__":
+    asyncio.run(cpu_bound())
+
+
+# a worker dying breaks a process pool; the slots are still released
+def crash() -> None:
+    os._exit(1)
+
+
+async def broken():
+    processes = OffloadPool("process", max_workers=2)
+    for f, args in [(crash, ()), (fib, (20,)), (fib, (20,)), (fib, (20,))]:
+        try:
+            await asyncio.wait_for(processes.run(f, *args), 5)
+        except concurrent.futures.process.BrokenProcessPool as e:
+            print(type(e).__name__)
+    # BrokenProcessPool
+    # BrokenProcessPool
+    # BrokenProcessPool
+    # BrokenProcessPool
+    print(processes.stats())
+    # {'waiting': 0, 'running': 0, 'completed': 0, 'cancelled': 0, 'failed': 4, 'max_waiting': 1} # noqa: E501
+    processes.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(broken())
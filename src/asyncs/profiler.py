@@ -0,0 +1,279 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class TaskStats:
+    """Times of a task in seconds.
+
+    - `wall`: from created to done
+    - `running`: running its steps on the loop
+    - `ready`: ready to run but waiting for other callbacks to finish
+    - `created_at`: since the profiler started
+    """
+    name: str
+    coro: str
+    created_at: float
+    steps: int = 0
+    wall: float = 0.0
+    running: float = 0.0
+    ready: float = 0.0
+
+
+@dataclass
+class SlowCallback:
+    at: float
+    duration: float
+    task: str | None
+    coro: str | None
+    callback: str
+
+
+@dataclass
+class LoopReport:
+    tasks: list[TaskStats]
+    # how long callbacks wait in the ready queue, in seconds
+    lag: dict[str, float]
+    slow_callbacks: list[SlowCallback]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def format(self) -> str:
+        lines = [
+            f"{'task':<12} {'coro':<12} {'steps':>5}"
+            f" {'wall':>7} {'running':>7} {'ready':>7}"
+        ]
+        for t in self.tasks:
+            lines.append(
+                f"{t.name:<12} {t.coro:<12} {t.steps:>5}"
+                f" {t.wall:7.3f} {t.running:7.3f} {t.ready:7.3f}")
+
+        lines.append("lag " + ", ".join(
+            f"{k}={v * 1e3:.3f}ms" for k, v in self.lag.items()))
+        for cb in self.slow_callbacks:
+            lines.append(
+                f"slow callback at {cb.at:.3f}s took {cb.duration:.3f}s"
+                f" in {cb.coro or cb.callback} ({cb.task or '-'})")
+
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1,
+                             int(len(sorted_values) * p / 100))]
+
+
+class LoopProfiler:
+    """Run a coroutine like `asyncio.run()` recording
+    how long each callback waited and ran on the event loop.
+
+    Every callback scheduled by `call_soon()` is timed,
+    which includes all steps of tasks,
+    so the profiler adds a few microseconds per step.
+
+    Args:
+        slow_callback_duration (float): callbacks running longer than this
+        in seconds are reported as slow like the debug mode of asyncio
+    """
+
+    def __init__(self, slow_callback_duration: float = 0.1) -> None:
+        self.slow_callback_duration = slow_callback_duration
+        self.tasks: dict[asyncio.Task, TaskStats] = {}
+        self.lags: list[float] = []
+        self.slow_callbacks: list[SlowCallback] = []
+        self.started_at = 0.0
+        self._running = False
+
+    def run(self, main: Coroutine) -> Any:
+        self.started_at = time.perf_counter()
+        self._running = True
+        with asyncio.Runner(loop_factory=self._new_loop) as runner:
+            try:
+                return runner.run(main)
+            finally:
+                # not to record tasks shutting down the loop
+                self._running = False
+
+    def _new_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        loop.call_soon = self._timed(loop.call_soon)  # type: ignore
+        loop.call_soon_threadsafe = \
+            self._timed(loop.call_soon_threadsafe)  # type: ignore
+        return loop
+
+    def _timed(self, call_soon: Callable) -> Callable:
+        perf_counter = time.perf_counter
+
+        def timed_call_soon(
+            callback: Callable, *args, context: Any = None,
+        ) -> asyncio.Handle:
+            scheduled_at = perf_counter()
+
+            def timed_callback(*args) -> None:
+                started_at = perf_counter()
+                try:
+                    callback(*args)
+                finally:
+                    self._record(
+                        callback, scheduled_at, started_at, perf_counter())
+            return call_soon(timed_callback, *args, context=context)
+        return timed_call_soon
+
+    def _record(
+        self,
+        callback: Callable,
+        scheduled_at: float,
+        started_at: float,
+        finished_at: float,
+    ) -> None:
+        if not self._running:
+            return
+
+        ready = started_at - scheduled_at
+        duration = finished_at - started_at
+        self.lags.append(ready)
+
+        # steps and wake-ups of tasks are bound methods of the tasks
+        task = getattr(callback, "__self__", None)
+        stats = None
+        if isinstance(task, asyncio.Task):
+            stats = self.tasks.get(task)
+            if stats is None:
+                stats = self.tasks[task] = TaskStats(
+                    task.get_name(), task.get_coro().__qualname__,
+                    created_at=scheduled_at - self.started_at)
+                task.add_done_callback(self._task_done)
+            stats.steps += 1
+            stats.running += duration
+            stats.ready += ready
+
+        if duration >= self.slow_callback_duration:
+            self.slow_callbacks.append(SlowCallback(
+                at=started_at - self.started_at,
+                duration=duration,
+                task=stats.name if stats else None,
+                coro=stats.coro if stats else None,
+                callback=repr(callback)))
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        stats = self.tasks[task]
+        stats.wall = \
+            time.perf_counter() - self.started_at - stats.created_at
+
+    def report(self) -> LoopReport:
+        lags = sorted(self.lags)
+        return LoopReport(
+            tasks=list(self.tasks.values()),
+            lag={
+                "p50": _percentile(lags, 50),
+                "p90": _percentile(lags, 90),
+                "p99": _percentile(lags, 99),
+                "max": lags[-1] if lags else 0.0,
+            },
+            slow_callbacks=self.slow_callbacks,
+        )
+
+
+# `src/asyncs/sleep.py` with 10x shorter sleeps
+async def f():
+    print(f"f() started at {time.strftime('%X')}")
+    time.sleep(0.5)   # some task which could take much time on the process
+    print(f"f() finished at {time.strftime('%X')}")
+
+
+async def g():
+    print(f"g() started at {time.strftime('%X')}")
+    await asyncio.sleep(0.3)  # some async task
+    print(f"g() finished at {time.strftime('%X')}")
+
+
+async def main():
+    task1 = asyncio.create_task(f(), name="task1")
+    task2 = asyncio.create_task(g(), name="task2")
+
+    print(f"main() started at {time.strftime('%X')}")
+
+    await task1
+    await task2
+
+    print(f"main() finished at {time.strftime('%X')}")
+
+
+profiler = LoopProfiler(slow_callback_duration=0.1)
+profiler.run(main())    # instead of `asyncio.run(main())`
+
+# main() started at 12:20:20
+# f() started at 12:20:20
+# f() finished at 12:20:21
+# g() started at 12:20:21
+# g() finished at 12:20:21
+# main() finished at 12:20:21
+
+report = profiler.report()
+print(report.format())
+# task         coro         steps    wall running   ready
+# Task-1       main             3   0.801   0.000   0.000
+# task1        f                1   0.501   0.500   0.000
+# task2        g                2   0.801   0.000   0.500
+# lag p50=0.073ms, p90=500.444ms, p99=500.444ms, max=500.444ms
+# slow callback at 0.000s took 0.500s in f (task1)
+
+# `g()` was ready to run for 0.5s while `f()` blocked the loop by `sleep()`
+
+print(report.to_json(indent=2))
+# {
+#   "tasks": [
+#     {
+#       "name": "Task-1",
+#       "coro": "main",
+#       "created_at": 0.00018877499996960978,
+#       "steps": 3,
+#       "wall": 0.8013091110001369,
+#       "running": 9.748600041348254e-05,
+#       "ready": 0.000314142999741307
+#     },
+#     {
+#       "name": "task1",
+#       "coro": "f",
+#       "created_at": 0.00026739300028566504,
+#       "steps": 1,
+#       "wall": 0.5005581039999925,
+#       "running": 0.500296796999919,
+#       "ready": 9.04149997040804e-05
+#     },
+#     {
+#       "name": "task2",
+#       "coro": "g",
+#       "created_at": 0.0002752300001702679,
+#       "steps": 2,
+#       "wall": 0.8011760919998778,
+#       "running": 0.0001436759998796333,
+#       "ready": 0.5004905520004286
+#     }
+#   ],
+#   "lag": {
+#     "p50": 7.272299990290776e-05,
+#     "p90": 0.5004436320000423,
+#     "p99": 0.5004436320000423,
+#     "max": 0.5004436320000423
+#   },
+#   "slow_callbacks": [
+#     {
+#       "at": 0.00035780799998974544,
+#       "duration": 0.500296796999919,
+#       "task": "task1",
+#       "coro": "f",
+#       "callback": "<TaskStepMethWrapper object at 0x7fb34407f130>"
+#     }
+#   ]
+# }
@@ -0,0 +1,293 @@
+import asyncio
+import contextlib
+import functools
+import os
+import signal
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CommandResult:
+    """The result of a command.
+
+    Only the last lines of the output are kept in `stdout_tail` and
+    `stderr_tail`; use `on_line` of `run_commands()` to see every line.
+    `error` is set instead of `returncode` if the command cannot be started,
+    e.g. `FileNotFoundError` for a missing executable.
+    """
+    index: int
+    args: Sequence[str]
+    returncode: int | None = None
+    error: OSError | None = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+    stdout_tail: deque[bytes] = field(default_factory=deque)
+    stderr_tail: deque[bytes] = field(default_factory=deque)
+
+
+# lines longer than this are split into pieces of this many bytes
+LINE_LIMIT = 1 << 16
+
+
+async def _pipe_lines(
+    stream: asyncio.StreamReader,
+    tail: deque[bytes],
+    on_line: Callable[[bytes], None] | None,
+) -> None:
+    def emit(line: bytes) -> None:
+        tail.append(line)
+        if on_line is not None:
+            on_line(line)
+
+    # `readline()` raises `ValueError` on a line over the limit
+    # of the stream, so lines are split here instead
+    pending = b""
+    while chunk := await stream.read(LINE_LIMIT):
+        pending += chunk
+        start = 0
+        while (end := pending.find(b"\n", start)) >= 0:
+            emit(pending[start:end + 1])
+            start = end + 1
+        while len(pending) - start >= LINE_LIMIT:
+            emit(pending[start:start + LINE_LIMIT])
+            start += LINE_LIMIT
+        pending = pending[start:]
+    if pending:
+        emit(pending)
+
+
+async def _read_pipes(
+    proc: asyncio.subprocess.Process,
+    result: CommandResult,
+    on_line: Callable[[int, str, bytes], None] | None,
+) -> None:
+    assert proc.stdout is not None and proc.stderr is not None
+    on_stdout: Callable[[bytes], None] | None = None
+    on_stderr: Callable[[bytes], None] | None = None
+    if on_line is not None:
+        on_stdout = functools.partial(on_line, result.index, "stdout")
+        on_stderr = functools.partial(on_line, result.index, "stderr")
+
+    await asyncio.gather(
+        _pipe_lines(proc.stdout, result.stdout_tail, on_stdout),
+        _pipe_lines(proc.stderr, result.stderr_tail, on_stderr),
+    )
+
+
+def _killpg(proc: asyncio.subprocess.Process, sig: int) -> None:
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        # every process of the group has exited
+        pass
+
+
+async def _stop(
+    proc: asyncio.subprocess.Process,
+    pipes: asyncio.Task,
+    kill_after: float,
+) -> None:
+    "SIGTERM the process group, then SIGKILL it if anything still runs"
+    _killpg(proc, signal.SIGTERM)
+    try:
+        # children in the group may outlive the process, holding the pipes
+        await asyncio.wait_for(
+            asyncio.gather(proc.wait(), asyncio.shield(pipes)), kill_after)
+    except asyncio.TimeoutError:
+        _killpg(proc, signal.SIGKILL)
+        await proc.wait()
+
+
+async def _close_pipes(pipes: asyncio.Task, timeout: float) -> None:
+    # children which left the process group may still hold the pipes
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(pipes, timeout)
+
+
+async def run_command(
+    index: int,
+    args: Sequence[str],
+    timeout: float | None = None,
+    kill_after: float = 1.0,
+    tail_lines: int = 10,
+    on_line: Callable[[int, str, bytes], None] | None = None,
+) -> CommandResult:
+    """Run a command streaming its output line by line.
+
+    The command runs in a new session, i.e. its own process group,
+    so signals reach its children too.
+    If the command and its children do not finish in `timeout` seconds,
+    they are terminated with SIGTERM, then killed with SIGKILL
+    if they still run after `kill_after` seconds.
+    """
+    result = CommandResult(
+        index, args,
+        stdout_tail=deque(maxlen=tail_lines),
+        stderr_tail=deque(maxlen=tail_lines))
+    started_at = time.perf_counter()
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True)
+    except OSError as e:
+        result.error = e
+        result.elapsed = time.perf_counter() - started_at
+        return result
+
+    pipes = asyncio.create_task(_read_pipes(proc, result, on_line))
+    finished = False
+    try:
+        # the pipes are closed once the process and its children exit
+        await asyncio.wait_for(
+            asyncio.gather(proc.wait(), asyncio.shield(pipes)), timeout)
+        finished = True
+    except asyncio.TimeoutError:
+        result.timed_out = True
+        await _stop(proc, pipes, kill_after)
+        finished = True
+    finally:
+        if not finished:
+            # cancelled, or `on_line` raised; nothing may outlive the command
+            _killpg(proc, signal.SIGKILL)
+            await proc.wait()
+        await _close_pipes(pipes, kill_after)
+
+    result.returncode = proc.returncode
+    result.elapsed = time.perf_counter() - started_at
+
+    return result
+
+
+async def run_commands(
+    commands: Iterable[Sequence[str]],
+    concurrency: int = 8,
+    timeout: float | None = None,
+    kill_after: float = 1.0,
+    tail_lines: int = 10,
+    on_line: Callable[[int, str, bytes], None] | None = None,
+) -> AsyncIterator[CommandResult]:
+    """Run commands with at most `concurrency` children at once
+    and yield their results in completion order.
+
+    `commands` is consumed lazily,
+    so it can be a generator of any number of commands.
+
+    Args:
+        commands (Iterable[Sequence[str]]): commands to run
+        concurrency (int): the max number of children running at once
+        timeout (float | None): seconds until a command is terminated
+        kill_after (float): seconds from SIGTERM to SIGKILL
+        tail_lines (int): the number of the last output lines to keep
+        on_line (Callable[[int, str, bytes], None] | None): a function called
+        with the index of the command, `"stdout"` or `"stderr"` and a line
+
+    Returns:
+        AsyncIterator[CommandResult]: results in completion order
+    """
+    it = enumerate(commands)
+    running: set[asyncio.Task[CommandResult]] = set()
+
+    def fill() -> None:
+        while len(running) < concurrency:
+            try:
+                index, args = next(it)
+            except StopIteration:
+                return
+            running.add(asyncio.create_task(run_command(
+                index, args, timeout, kill_after, tail_lines, on_line)))
+
+    fill()
+    try:
+        while running:
+            done, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.remove(task)
+                yield task.result()
+            fill()
+    finally:
+        # stop the rest if the caller stops iterating
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+def print_line(index: int, stream: str, line: bytes) -> None:
+    print(index, stream, line)
+
+
+async def main():
+    commands = [
+        ["sleep", "0.3"],
+        ["sh", "-c", "echo hello; echo world >&2"],
+        ["sleep", "5"],
+        ["sh", "-c", "trap '' TERM; sleep 5"],
+        ["false"],
+        ["sh", "-c", "sleep 5; echo never"],
+        ["nonexistent-cmd"],
+    ]
+    async for result in run_commands(
+            commands, concurrency=4, timeout=1.0, on_line=print_line):
+        print(result.index, result.args, result.returncode,
+              "timed out" if result.timed_out else "",
+              f"{result.elapsed:.1f}s", result.error,
+              list(result.stdout_tail), list(result.stderr_tail))
+
+asyncio.run(main())
+# 1 stdout b'hello\n'
+# 1 stderr b'world\n'
+# 1 ['sh', '-c', 'echo hello; echo world >&2'] 0  0.0s None [b'hello\n'] [b'world\n']  # noqa: E501
+# 4 ['false'] 1  0.0s None [] []
+# 0 ['sleep', '0.3'] 0  0.3s None [] []
+# 6 ['nonexistent-cmd'] None  0.0s [Errno 2] No such file or directory: 'nonexistent-cmd' [] []  # noqa: E501
+# 2 ['sleep', '5'] -15 timed out 1.0s None [] []
+# 5 ['sh', '-c', 'sleep 5; echo never'] -15 timed out 1.0s None [] []
+# 3 ['sh', '-c', "trap '' TERM; sleep 5"] -9 timed out 2.0s None [] []
+
+
+# a line longer than `LINE_LIMIT` is split, and the command still times out
+async def long_line():
+    result = await run_command(0, [
+        "sh", "-c", "head -c 200000 /dev/zero | tr '\\0' x; sleep 5",
+    ], timeout=1.0)
+    print(result.returncode, "timed out" if result.timed_out else "",
+          f"{result.elapsed:.1f}s", [len(line) for line in result.stdout_tail])
+
+asyncio.run(long_line())
+# -15 timed out 1.0s [65536, 65536, 65536, 3392]
+
+
+# benchmark
+async def bench(concurrency: int, n: int) -> float:
+    started_at = time.perf_counter()
+    async for result in run_commands(
+            (["sleep", "0.05"] for _ in range(n)), concurrency):
+        assert result.returncode == 0
+    return n / (time.perf_counter() - started_at)
+
+
+print(f"{'concurrency':>11} {'commands':>9} {'commands/s':>11}")
+for concurrency in [1, 8, 64, 512]:
+    n = max(32, 4 * concurrency)
+    rate = asyncio.run(bench(concurrency, n))
+    print(f"{concurrency:>11} {n:>9} {rate:11.1f}")
+
+"""
+Python 3.11.7, 1 CPU, each command is `sleep 0.05`
+
+concurrency  commands  commands/s
+          1        32        19.0
+          8        32       140.1
+         64       256       756.4
+        512      2048       689.7
+
+Throughput grows with concurrency until spawning processes
+and reading their pipes saturate the CPU (~700-750 commands/s here).
+Beyond that, more children only cost more file descriptors and memory.
+"""
@@ -0,0 +1,181 @@
+import time
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from types import MappingProxyType
+from typing import Any
+
+
+class BiDict(MutableMapping):
+    """A dict whose inverse is kept in sync on every insert and delete.
+
+    Values must be unique and hashable like keys.
+    Setting a value which another key already has raises `ValueError`
+    instead of silently breaking the inverse; use `force()` to move it.
+    `inverse` is a read-only view of the inverse dict; it is never copied.
+
+    Args:
+        items (Mapping | Iterable[tuple]): initial pairs as `dict()` takes
+    """
+    __slots__ = ("_fwd", "_inv", "inverse")
+
+    def __init__(self, items: Mapping | Iterable[tuple] = (), /) -> None:
+        self._fwd: dict = {}
+        self._inv: dict = {}
+        self.inverse: Mapping = MappingProxyType(self._inv)
+        self.update(items)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._fwd[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._fwd
+
+    def __iter__(self) -> Iterator:
+        return iter(self._fwd)
+
+    def __len__(self) -> int:
+        return len(self._fwd)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        owner = self._inv.get(value, key)
+        if owner != key:
+            raise ValueError(f"{value!r} is already the value of {owner!r}")
+        self._set(key, value)
+
+    def force(self, key: Any, value: Any) -> None:
+        "set `value` to `key`, removing the key which had `value` if any"
+        owner = self._inv.get(value, key)
+        if owner != key:
+            del self._fwd[owner]
+        self._set(key, value)
+
+    def _set(self, key: Any, value: Any) -> None:
+        if key in self._fwd:
+            del self._inv[self._fwd[key]]
+        self._fwd[key] = value
+        self._inv[value] = key
+
+    def __delitem__(self, key: Any) -> None:
+        del self._inv[self._fwd.pop(key)]
+
+    def update(self, items: Mapping | Iterable[tuple] = (), /) -> None:
+        """Set pairs in bulk; all or nothing.
+
+        All pairs are validated before both dicts are updated,
+        so nothing is changed if any value collides.
+        """
+        new = dict(items)
+        new_inv = dict(zip(new.values(), new.keys()))
+        if len(new_inv) != len(new):
+            raise ValueError(f"duplicate values: {_duplicates(new)!r}")
+
+        # `filter()` by `__contains__` is cheaper than `keys() & keys()`,
+        # which builds a set
+        for value in filter(self._inv.__contains__, new_inv):
+            owner = self._inv[value]
+            # fine if the owner gets the value or another value
+            if owner != new_inv[value] and owner not in new:
+                raise ValueError(
+                    f"{value!r} is already the value of {owner!r}")
+
+        for key in filter(self._fwd.__contains__, new):
+            del self._inv[self._fwd[key]]
+        self._fwd.update(new)
+        self._inv.update(new_inv)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._fwd!r})"
+
+
+def _duplicates(d: dict) -> dict:
+    "values of several keys with the keys"
+    keys_by_value: dict = {}
+    for k, v in d.items():
+        keys_by_value.setdefault(v, []).append(k)
+    return {v: ks for v, ks in keys_by_value.items() if len(ks) > 1}
+
+
+en2ja = BiDict({
+    "dog": "いぬ",
+    "cat": "ねこ",
+    "cow": "うし",
+})
+
+ja2en = en2ja.inverse
+print(ja2en["ねこ"])     # cat
+
+# the inverse follows updates
+en2ja["horse"] = "うま"
+del en2ja["cow"]
+print(dict(ja2en))
+# {'いぬ': 'dog', 'ねこ': 'cat', 'うま': 'horse'}
+
+# en2ja["kitty"] = "ねこ"
+# ValueError: 'ねこ' is already the value of 'cat'
+
+en2ja.force("kitty", "ねこ")
+print(en2ja)
+# BiDict({'dog': 'いぬ', 'horse': 'うま', 'kitty': 'ねこ'})
+
+# BiDict([("dog", "いぬ"), ("puppy", "いぬ")])
+# ValueError: duplicate values: {'いぬ': ['dog', 'puppy']}
+
+# ja2en["さる"] = "monkey"
+# TypeError: 'mappingproxy' object does not support item assignment
+
+
+# benchmark
+n = 1_000_000
+pairs = [(f"word{i}", f"単語{i}") for i in range(n)]
+updates = [(f"word{i}", f"新語{i}") for i in range(0, n, 10)]
+
+print(f"{'':>34} {'ms':>8}")
+
+
+def bench(name: str, f: Any) -> None:
+    start = time.perf_counter()
+    f()
+    print(f"{name:>34} {(time.perf_counter() - start) * 1e3:8.1f}")
+
+
+# dicts as `src/comprehensions/dicts/01.py`
+d = dict(pairs)
+bench("build dict + inverse comprehension",
+      lambda: {v: k for k, v in dict(pairs).items()})
+bench("build BiDict", lambda: BiDict(pairs))
+
+
+def update_dict() -> None:
+    d.update(updates)
+    # the inverse has to be built again
+    {v: k for k, v in d.items()}
+
+
+bidict = BiDict(pairs)
+bench("update 10% + rebuild inverse", update_dict)
+bench("BiDict.update() 10%", lambda: bidict.update(updates))
+
+
+def set_one_by_one() -> None:
+    for k, v in updates:
+        bidict[k] = v + "!"
+
+
+bench("bidict[k] = v for 10%", set_one_by_one)
+
+"""
+Python 3.11.7, 1 CPU, 1000000 pairs
+
+                                         ms
+build dict + inverse comprehension    755.5
+                      build BiDict    890.8
+      update 10% + rebuild inverse    468.1
+               BiDict.update() 10%    265.1
+             bidict[k] = v for 10%    220.8
+
+Building both directions costs about the same either way,
+but after that, an update touches only the updated pairs
+instead of building the whole inverse again.
+`update()` is not faster than setting pairs one by one;
+both are bound by memory access to dicts of 1000000 entries,
+and `update()` makes a few more passes to validate pairs first.
+"""
@@ -0,0 +1,140 @@
+import random
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Literal
+
+
+def project(
+    d: Mapping,
+    keys: Iterable,
+    order: Literal["dict", "keys"] | None = "dict",
+) -> dict:
+    """Items of `d` whose keys are in `keys`.
+
+    Same as `{k: v for k, v in d.items() if k in keys}`,
+    but `keys` is looked up as a set or `d` is probed by `keys`
+    instead of scanning a list for each item.
+
+    Args:
+        d (Mapping): items to be projected
+        keys (Iterable): keys to keep; keys not in `d` are ignored
+        order (Literal["dict", "keys"] | None): the order of the result;
+            "dict" scans `d` in O(len(d)),
+            "keys" probes `d` by `keys` in O(len(keys)),
+            and None takes the cheaper of them
+
+    Returns:
+        dict: the projected items
+    """
+    if order == "keys" or order is None and _probe_is_cheaper(d, keys):
+        return {k: d[k] for k in keys if k in d}
+
+    if order not in ("dict", None):
+        raise ValueError(f"unknown order: {order!r}")
+
+    wanted = keys if isinstance(keys, set | frozenset) else set(keys)
+    # `filter()` runs `__contains__` in C; Python code runs only for hits
+    return {k: d[k] for k in filter(wanted.__contains__, d)}
+
+
+def _probe_is_cheaper(d: Mapping, keys: Iterable) -> bool:
+    # a set of `keys` for scanning costs about as much as probing by them,
+    # so probing wins unless `keys` is as large as `d`
+    try:
+        return len(keys) < len(d)   # type: ignore
+    except TypeError:
+        # e.g. a generator
+        return True
+
+
+def iter_project(
+    items: Mapping | Iterable[tuple],
+    keys: Iterable,
+) -> Iterator[tuple]:
+    """Pairs of `items` whose keys are in `keys`, one by one.
+
+    `items` may be a stream of pairs, e.g. lines of a file,
+    so neither the catalog nor the result have to be in memory.
+    """
+    wanted = keys if isinstance(keys, set | frozenset) else set(keys)
+    if isinstance(items, Mapping):
+        items = items.items()
+    return ((k, v) for k, v in items if k in wanted)
+
+
+fruits = {
+    "apple": 100,
+    "banana": 200,
+    "orange": 300,
+    "grape": 400,
+}
+
+my_wish_list = ["orange", "apple", "melon"]
+
+print(project(fruits, my_wish_list))    # {'apple': 100, 'orange': 300}
+print(project(fruits, my_wish_list, order="keys"))
+# {'orange': 300, 'apple': 100}
+
+for k, v in iter_project(iter(fruits.items()), my_wish_list):
+    print(k, v)
+# apple 100
+# orange 300
+
+
+# benchmark
+def comprehension(d: dict, wish_list: list) -> dict:
+    "as `src/comprehensions/dicts/02.py`"
+    return {k: v for k, v in d.items() if k in wish_list}
+
+
+def keys_and(d: dict, wish_list: list) -> dict:
+    return {k: d[k] for k in d.keys() & wish_list}
+
+
+random.seed(0)
+n = 1_000_000
+catalog = {f"item{i}": i for i in range(n)}
+names = list(catalog)
+
+print(f"{'wish list':>10} {'list':>8} {'set':>8} {'keys &':>8}"
+      f" {'dict':>8} {'keys':>8} {'None':>8}  (ms)")
+for m in [10, 1_000, 100_000, 1_000_000]:
+    # a half of the wish list is in the catalog
+    wish_list = random.sample(names, m // 2) \
+        + [f"missing{i}" for i in range(m - m // 2)]
+    row = []
+    for f in [
+        comprehension,
+        lambda d, ks: comprehension(d, set(ks)),
+        keys_and,
+        lambda d, ks: project(d, ks),
+        lambda d, ks: project(d, ks, order="keys"),
+        lambda d, ks: project(d, ks, order=None),
+    ]:
+        if f is comprehension and m > 10:
+            # O(n * m); hours
+            row.append(f"{'-':>8}")
+            continue
+        start = time.perf_counter()
+        res = f(catalog, wish_list)
+        row.append(f"{(time.perf_counter() - start) * 1e3:8.1f}")
+        assert len(res) == m // 2
+    print(f"{m:>10} {' '.join(row)}")
+
+"""
+Python 3.11.7, 1 CPU, a catalog of 1000000 items,
+a half of the wish list is in the catalog
+
+ wish list     list      set   keys &     dict     keys     None  (ms)
+        10    270.8     68.0      0.0     35.8      0.0      0.0
+      1000        -     58.5      0.7     49.1      0.6      0.2
+    100000        -    136.7     82.0    124.5     66.4     64.9
+   1000000        -    656.7    746.5    595.6    662.8    559.4
+
+"list" is the comprehension of `dicts/02.py`; `in` scans the list.
+"dict" keeps the order of the catalog and always scans it,
+but `filter()` checks keys in C, up to 2x faster than the comprehension.
+"keys" probes the catalog by the wish list; O(len(wish list)).
+`d.keys() & keys` builds a set first and is never cheaper than probing,
+so `order=None` chooses between probing and scanning only.
+"""
@@ -0,0 +1,216 @@
+import random
+import time
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from functools import partial
+from typing import Any
+
+
+class IndexedCollection:
+    """A collection of dict rows indexed by a primary key
+    and optionally by secondary keys.
+
+    Point lookups by the primary key and by secondary keys are O(1).
+    The indexes are maintained on `insert()`, `delete()` and `update()`,
+    so rows must not be mutated in place.
+
+    Args:
+        rows (Iterable[dict]): initial rows
+        key (str): the primary key; must be unique
+        indexes (Iterable[str]): secondary keys; need not be unique
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[dict] = (),
+        key: str = "id",
+        indexes: Iterable[str] = (),
+    ) -> None:
+        self.key = key
+        self._rows: dict[Hashable, dict] = {}
+        # secondary key -> value -> primary keys of the rows with the value.
+        # primary keys are kept as dict keys to be an ordered set.
+        self._indexes: dict[str, dict[Hashable, dict[Hashable, None]]] = {
+            attr: {} for attr in indexes
+        }
+
+        for row in rows:
+            self.insert(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._rows.values())
+
+    def __contains__(self, pk: Hashable) -> bool:
+        return pk in self._rows
+
+    def get(self, pk: Hashable, default: Any = None) -> dict | Any:
+        "same as `next(filter(lambda row: row[key] == pk, rows), default)`"
+        return self._rows.get(pk, default)
+
+    def find_by(self, attr: str, value: Hashable) -> list[dict]:
+        "same as `[row for row in rows if row[attr] == value]`"
+        index = self._indexes.get(attr)
+        if index is None:
+            raise KeyError(f"`{attr}` is not indexed")
+
+        rows = self._rows
+        return [rows[pk] for pk in index.get(value, ())]
+
+    def insert(self, row: dict) -> None:
+        pk = row[self.key]
+        if pk in self._rows:
+            raise ValueError(f"duplicate {self.key}: {pk!r}")
+
+        self._insert(pk, row, self._index_values(row))
+
+    def _index_values(self, row: dict) -> list[Hashable]:
+        # all index keys are read and hashed before anything is mutated,
+        # so a missing or unhashable value leaves the collection intact
+        values = [row[attr] for attr in self._indexes]
+        for value in values:
+            hash(value)
+        return values
+
+    def _insert(self, pk: Hashable, row: dict, values: list) -> None:
+        self._rows[pk] = row
+        for index, value in zip(self._indexes.values(), values):
+            index.setdefault(value, {})[pk] = None
+
+    def delete(self, pk: Hashable) -> dict:
+        row = self._rows.pop(pk)
+        for attr, index in self._indexes.items():
+            pks = index[row[attr]]
+            del pks[pk]
+            if not pks:
+                del index[row[attr]]
+
+        return row
+
+    def update(self, pk: Hashable, **changes: Any) -> dict:
+        "replace the row of `pk` with a copy applied `changes`"
+        if self.key in changes and changes[self.key] != pk:
+            raise ValueError(f"{self.key} cannot be updated")
+
+        new_row = self._rows[pk] | changes
+        values = self._index_values(new_row)
+        self.delete(pk)
+        self._insert(pk, new_row, values)
+
+        return new_row
+
+
+users = IndexedCollection(
+    [
+        {
+            "id": 0,
+            "name": "alice",
+            "active": True,
+        },
+        {
+            "id": 1,
+            "name": "bob",
+            "active": False,
+        },
+        {
+            "id": 2,
+            "name": "eve",
+            "active": True,
+        },
+    ],
+    key="id",
+    indexes=["active"],
+)
+
+
+# primary key lookup
+user100 = users.get(100)
+print(user100)  # None
+
+print(users.get(2))  # {'id': 2, 'name': 'eve', 'active': True}
+
+
+# secondary key lookup
+print(users.find_by("active", True))
+# [
+#   {'id': 0, 'name': 'alice', 'active': True},
+#   {'id': 2, 'name': 'eve', 'active': True},
+# ]
+
+
+# the indexes follow inserts, updates and deletes
+users.insert({"id": 100, "name": "mallory", "active": False})
+print(users.get(100))   # {'id': 100, 'name': 'mallory', 'active': False}
+
+users.update(1, active=True)
+print([user["name"] for user in users.find_by("active", True)])
+# ['alice', 'eve', 'bob']
+
+users.delete(0)
+print(users.get(0))  # None
+print([user["name"] for user in users.find_by("active", True)])
+# ['eve', 'bob']
+
+# users.insert({"id": 2, "name": "eve", "active": True})
+# ValueError: duplicate id: 2
+
+
+# benchmark
+def lookup_imperative(rows: list[dict], id: int) -> dict | None:
+    found = None
+    for row in rows:
+        if row["id"] == id:
+            found = row
+            break
+    return found
+
+
+def lookup_next_filter(rows: list[dict], id: int) -> dict | None:
+    return next(filter(lambda row: row["id"] == id, rows), None)
+
+
+def lookup_comprehension(rows: list[dict], id: int) -> dict | None:
+    return found[0] if (
+        found := [row for row in rows if row["id"] == id]) else None
+
+
+def lookups_per_sec(lookup: Callable[[int], Any], ids: list[int]) -> float:
+    start = time.perf_counter()
+    for id in ids:
+        lookup(id)
+    return len(ids) / (time.perf_counter() - start)
+
+
+random.seed(0)
+print(f"{'rows':>8} {'imperative':>12} {'next+filter':>12}"
+      f" {'comprehension':>14} {'index':>12}  (lookups/s)")
+for n in [1_000, 10_000, 100_000]:
+    rows = [{"id": i, "name": f"user{i}", "active": i % 2 == 0}
+            for i in range(n)]
+    indexed = IndexedCollection(rows, indexes=["active"])
+    # half hits at random positions and half misses
+    ids = [random.randrange(2 * n) for _ in range(max(10, 100_000 // n))]
+
+    rates = [
+        lookups_per_sec(partial(lookup, rows), ids)
+        for lookup in [
+            lookup_imperative, lookup_next_filter, lookup_comprehension]
+    ]
+    rates.append(lookups_per_sec(indexed.get, ids * 100))
+    print(f"{n:>8} {rates[0]:12,.0f} {rates[1]:12,.0f}"
+          f" {rates[2]:14,.0f} {rates[3]:12,.0f}")
+
+"""
+Python 3.11.7, 1 CPU
+
+    rows   imperative  next+filter  comprehension        index  (lookups/s)
+    1000       40,739       18,621         33,337   12,655,601
+   10000        4,362        1,598          3,356   10,751,185
+  100000          356          180            310    3,496,137
+
+The three idioms scan the rows, so the rate drops 10x per 10x rows.
+`next()` + `filter()` is the slowest because it calls the lambda per row,
+and the comprehension cannot stop at the first match.
+The index answers with one dict lookup regardless of the number of rows.
+"""
@@ -0,0 +1,224 @@
+import sys
+import time
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain, compress, count
+
+
+# flags of the 8 bits of each byte value;
+# `_FLAGS[0b101]` is `(True, False, True, False, False, False, False, False)`
+_FLAGS = tuple(
+    tuple(bool(byte >> b & 1) for b in range(8)) for byte in range(256)
+)
+
+
+class UserTable:
+    """Users stored column by column instead of as a list of dicts.
+
+    - `ids` are 8-byte integers in an `array("q")`
+    - `active` flags are bits in a `bytearray` bitmap
+    - `names` are 4-byte references to an interned string pool
+
+    A row costs about 12 bytes plus its share of the name pool,
+    while a dict row costs hundreds of bytes.
+    """
+
+    def __init__(self, rows: Iterable[dict] = ()) -> None:
+        self.ids = array("q")
+        self.name_refs = array("I")
+        self.actives = bytearray()
+        self.name_pool: list[str] = []
+        self._name_refs: dict[str, int] = {}
+
+        for row in rows:
+            self.append(row["id"], row["name"], row["active"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> dict:
+        "materialize the `i`-th row as a dict"
+        # negative indices have to be normalized for the bitmap
+        i = range(len(self))[i]
+        return {
+            "id": self.ids[i],
+            "name": self.name_pool[self.name_refs[i]],
+            "active": self.is_active(i),
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, id: int, name: str, active: bool) -> None:
+        i = len(self.ids)
+        self.ids.append(id)
+
+        ref = self._name_refs.get(name)
+        if ref is None:
+            ref = self._name_refs[name] = len(self.name_pool)
+            self.name_pool.append(sys.intern(name))
+        self.name_refs.append(ref)
+
+        if i & 7 == 0:
+            self.actives.append(0)
+        if active:
+            self.actives[i >> 3] |= 1 << (i & 7)
+
+    def is_active(self, i: int) -> bool:
+        return bool(self.actives[i >> 3] >> (i & 7) & 1)
+
+    def active_flags(self) -> Iterator[bool]:
+        "unpack the bitmap to one flag per row without a Python-level loop"
+        return chain.from_iterable(map(_FLAGS.__getitem__, self.actives))
+
+    def active_indices(self) -> Iterator[int]:
+        return compress(count(), self.active_flags())
+
+    def select_active(self, column: Iterable) -> Iterator:
+        "values of `column` (e.g. `ids`) in active rows"
+        return compress(column, self.active_flags())
+
+    def count_active(self) -> int:
+        return int.from_bytes(self.actives, "little").bit_count()
+
+    def where_active(self) -> list[dict]:
+        "same as `[user for user in users if user['active']]`"
+        return [self[i] for i in self.active_indices()]
+
+    def find(self, id: int) -> dict | None:
+        "same as `next(filter(lambda user: user['id'] == id, users), None)`"
+        try:
+            return self[self.ids.index(id)]
+        except ValueError:
+            return None
+
+    def names(self, indices: Iterable[int] | None = None) -> list[str]:
+        "project the `name` column of the given rows (all rows by default)"
+        pool, refs = self.name_pool, self.name_refs
+        if indices is None:
+            return [pool[ref] for ref in refs]
+        return [pool[refs[i]] for i in indices]
+
+    def nbytes(self) -> int:
+        "approximate memory used by the table including the name pool"
+        return (
+            sys.getsizeof(self.ids)
+            + sys.getsizeof(self.name_refs)
+            + sys.getsizeof(self.actives)
+            + sys.getsizeof(self.name_pool)
+            + sys.getsizeof(self._name_refs)
+            + sum(sys.getsizeof(name) for name in self.name_pool)
+        )
+
+
+users = UserTable([
+    {
+        "id": 0,
+        "name": "alice",
+        "active": True,
+    },
+    {
+        "id": 1,
+        "name": "bob",
+        "active": False,
+    },
+    {
+        "id": 2,
+        "name": "eve",
+        "active": True,
+    },
+])
+
+
+# filter; `[user for user in users if user["active"]]`
+active_users = users.where_active()
+print(active_users)
+# [
+#   {'id': 0, 'name': 'alice', 'active': True},
+#   {'id': 2, 'name': 'eve', 'active': True},
+# ]
+
+# projection
+print(users.names(users.active_indices()))    # ['alice', 'eve']
+
+# lookup; `next(filter(lambda user: user["id"] == 100, users), None)`
+print(users.find(2))    # {'id': 2, 'name': 'eve', 'active': True}
+print(users.find(100))  # None
+
+# rows are still iterable as dicts
+print(list(users) == [users[0], users[1], users[2]])  # True
+print(users[-1] == users[2])    # True
+
+
+# benchmark
+def make_rows(n: int) -> Iterator[dict]:
+    for i in range(n):
+        yield {
+            "id": i,
+            "name": f"user{i % 1000}",
+            "active": i % 3 != 0,
+        }
+
+
+def dict_rows_nbytes(rows: list[dict]) -> int:
+    return sys.getsizeof(rows) + sum(
+        sys.getsizeof(row) + sys.getsizeof(row["id"])
+        + sys.getsizeof(row["name"])
+        for row in rows
+    )
+
+
+def rate(n: int, f: Callable) -> str:
+    start = time.perf_counter()
+    f()
+    return f"{n / (time.perf_counter() - start) / 1e6:8.1f}"
+
+
+def bench_dicts(n: int) -> None:
+    last_id = n - 1
+    rows = list(make_rows(n))
+
+    def find_last() -> dict | None:
+        return next(filter(lambda user: user["id"] == last_id, rows), None)
+
+    print(f"{n:>10} {'dicts':>8} {dict_rows_nbytes(rows) / n:6.1f}"
+          f" {rate(n, lambda: sum(1 for u in rows if u['active']))}"
+          f" {rate(n, lambda: [u['id'] for u in rows if u['active']])}"
+          f" {rate(n, find_last)}")
+
+
+def bench_columns(n: int) -> None:
+    last_id = n - 1
+    table = UserTable(make_rows(n))
+    print(f"{n:>10} {'columns':>8} {table.nbytes() / n:6.1f}"
+          f" {rate(n, table.count_active)}"
+          f" {rate(n, lambda: list(table.select_active(table.ids)))}"
+          f" {rate(n, lambda: table.find(last_id))}")
+
+
+print(f"{'rows':>10} {'form':>8} {'B/row':>6}"
+      f" {'count':>8} {'active':>8} {'find':>8}  (M rows/s)")
+for n in [1_000_000, 10_000_000]:
+    # rows of each form are freed when the function returns
+    bench_dicts(n)
+    bench_columns(n)
+
+"""
+Python 3.11.7, 1 CPU, million rows per second
+
+      rows     form  B/row    count   active     find  (M rows/s)
+   1000000    dicts  276.3     15.6     14.5     10.4
+   1000000  columns   12.5   2979.6     15.0     31.0
+  10000000    dicts  276.8     16.5     14.1     10.7
+  10000000  columns   12.4   3539.7     14.8     27.2
+
+count: number of active users
+active: ids of active users
+find: the last user by `id`
+
+A dict row costs ~276 bytes (dict, `int` and `str` objects),
+a columnar row ~12 bytes (8 for `id`, 4 for the name reference, 1 bit).
+Counting active users is a popcount over the bitmap.
+Listing active ids is bound by creating `int` objects on both forms.
+"""
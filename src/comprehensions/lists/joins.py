@@ -0,0 +1,284 @@
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal
+
+
+JoinHow = Literal["inner", "left", "anti"]
+
+
+def build_index(rows: Iterable[dict], key: str) -> dict[Any, list[dict]]:
+    """Return a hash index mapping each value of `key` to its rows.
+
+    Args:
+        rows (Iterable[dict]): rows to index
+        key (str): key of the rows to index on
+
+    Returns:
+        dict[Any, list[dict]]: rows grouped by `key` keeping their order
+    """
+    index: dict[Any, list[dict]] = {}
+    for row in rows:
+        k = row[key]
+        bucket = index.get(k)
+        if bucket is None:
+            index[k] = [row]
+        else:
+            bucket.append(row)
+
+    return index
+
+
+def hash_join(
+    left: Iterable[dict],
+    right: Iterable[dict],
+    on: str,
+    how: JoinHow = "inner",
+) -> Iterator[tuple[dict, dict | None]]:
+    """Join `left` and `right` on `on` by building a hash index on `right`.
+
+    `right` (build side) is loaded into memory once,
+    while `left` (probe side) is consumed lazily,
+    so `left` can be a stream of any length such as rows read from a file.
+
+    Args:
+        left (Iterable[dict]): probe side rows
+        right (Iterable[dict]): build side rows
+        on (str): key of both sides to join on
+        how (JoinHow): `"inner"`, `"left"` or `"anti"`
+
+    Returns:
+        Iterator[tuple[dict, dict | None]]: pairs of joined rows.
+        the right row is `None` for unmatched left rows of `"left"` and
+        `"anti"` joins.
+    """
+    index = build_index(right, on)
+
+    if how == "inner":
+        for l_row in left:
+            for r_row in index.get(l_row[on], ()):
+                yield l_row, r_row
+    elif how == "left":
+        for l_row in left:
+            r_rows = index.get(l_row[on])
+            if r_rows is None:
+                yield l_row, None
+                continue
+            for r_row in r_rows:
+                yield l_row, r_row
+    elif how == "anti":
+        for l_row in left:
+            if l_row[on] not in index:
+                yield l_row, None
+    else:
+        raise ValueError(f"unknown join type: {how!r}")
+
+
+def sort_merge_join(
+    left: Iterable[dict],
+    right: Iterable[dict],
+    on: str,
+    how: JoinHow = "inner",
+    presorted: bool = False,
+) -> Iterator[tuple[dict, dict | None]]:
+    """Join `left` and `right` on `on` by merging them in the order of `on`.
+
+    Rows are yielded in the order of `on`, not in the order of `left`.
+    Pass `presorted=True` if both sides are already sorted by `on`
+    to skip sorting; then both sides are consumed lazily.
+
+    Args:
+        left (Iterable[dict]): left rows
+        right (Iterable[dict]): right rows
+        on (str): key of both sides to join on
+        how (JoinHow): `"inner"`, `"left"` or `"anti"`
+        presorted (bool): whether both sides are already sorted by `on`
+
+    Returns:
+        Iterator[tuple[dict, dict | None]]: pairs of joined rows.
+        the right row is `None` for unmatched left rows of `"left"` and
+        `"anti"` joins.
+    """
+    if how not in ("inner", "left", "anti"):
+        raise ValueError(f"unknown join type: {how!r}")
+
+    if not presorted:
+        left = sorted(left, key=lambda row: row[on])
+        right = sorted(right, key=lambda row: row[on])
+
+    r_it = iter(right)
+    r_row = next(r_it, None)
+    # rows of `right` sharing the key of the last matched left row
+    r_group: list[dict] = []
+    r_group_key: Any = None
+
+    for l_row in left:
+        k = l_row[on]
+        if not r_group or r_group_key != k:
+            while r_row is not None and r_row[on] < k:
+                r_row = next(r_it, None)
+            r_group = []
+            r_group_key = k
+            while r_row is not None and r_row[on] == k:
+                r_group.append(r_row)
+                r_row = next(r_it, None)
+
+        if how == "inner":
+            for r in r_group:
+                yield l_row, r
+        elif not r_group:
+            yield l_row, None
+        elif how == "left":
+            for r in r_group:
+                yield l_row, r
+
+
+def nested_loop_join(
+    left: Iterable[dict],
+    right: list[dict],
+    on: str,
+) -> Iterator[tuple[dict, dict]]:
+    "inner join scanning all `right` rows for every `left` row; O(n*m)"
+    for l_row in left:
+        for r_row in right:
+            if l_row[on] == r_row[on]:
+                yield l_row, r_row
+
+
+users = [
+    {
+        "id": 0,
+        "name": "alice",
+        "active": True,
+    },
+    {
+        "id": 1,
+        "name": "bob",
+        "active": False,
+    },
+    {
+        "id": 2,
+        "name": "eve",
+        "active": True,
+    },
+    {
+        "id": 3,
+        "name": "mallory",
+        "active": False,
+    },
+]
+
+email_settings = [
+    {
+        "id": 2,
+        "email": "eve@example.com",
+    },
+    {
+        "id": 0,
+        "email": "alice@example.com",
+    },
+    {
+        "id": 1,
+        "email": "bob@example.com",
+    },
+]
+
+
+# inner join; same pairs as `src/comprehensions/lists/03.py`
+name_and_email_pairs = [
+    (user["name"], email_setting["email"])
+    for user, email_setting in hash_join(users, email_settings, "id")
+]
+print(name_and_email_pairs)
+# [
+#   ('alice', 'alice@example.com'),
+#   ('bob', 'bob@example.com'),
+#   ('eve', 'eve@example.com'),
+# ]
+
+name_and_email_pairs = [
+    (user["name"], email_setting["email"])
+    for user, email_setting in sort_merge_join(users, email_settings, "id")
+]
+print(name_and_email_pairs)
+# [
+#   ('alice', 'alice@example.com'),
+#   ('bob', 'bob@example.com'),
+#   ('eve', 'eve@example.com'),
+# ]
+
+
+# left join
+name_and_email_pairs = [
+    (user["name"], email_setting["email"] if email_setting else None)
+    for user, email_setting
+    in hash_join(users, email_settings, "id", how="left")
+]
+print(name_and_email_pairs)
+# [
+#   ('alice', 'alice@example.com'),
+#   ('bob', 'bob@example.com'),
+#   ('eve', 'eve@example.com'),
+#   ('mallory', None),
+# ]
+
+
+# anti join; users without email settings
+names = [
+    user["name"]
+    for user, _ in hash_join(users, email_settings, "id", how="anti")
+]
+print(names)    # ['mallory']
+
+
+# streaming probe side; `users` can be a generator of any length
+user_stream = (user for user in users if user["active"])
+for user, email_setting in hash_join(user_stream, email_settings, "id"):
+    print(user["name"], email_setting["email"])
+# alice alice@example.com
+# eve eve@example.com
+
+
+# benchmark
+def make_rows(n: int) -> tuple[list[dict], list[dict]]:
+    left = [{"id": i, "name": f"user{i}"} for i in range(n)]
+    right = [{"id": i, "email": f"user{i}@example.com"}
+             for i in range(n - 1, -1, -1)]
+    return left, right
+
+
+def bench(join: Any, left: list[dict], right: list[dict]) -> float:
+    start = time.perf_counter()
+    pairs = [(l_row["name"], r_row["email"])
+             for l_row, r_row in join(left, right, "id")]
+    elapsed = time.perf_counter() - start
+    assert len(pairs) == len(left)
+    return elapsed
+
+
+print(f"{'n = m':>9} {'nested':>9} {'hash':>9} {'merge':>9}")
+for n in [100, 1_000, 5_000, 100_000, 1_000_000]:
+    left, right = make_rows(n)
+    nested = f"{bench(nested_loop_join, left, right):9.3f}" \
+        if n <= 5_000 else f"{'-':>9}"
+    print(f"{n:>9} {nested}"
+          f" {bench(hash_join, left, right):9.3f}"
+          f" {bench(sort_merge_join, left, right):9.3f}")
+
+"""
+Python 3.11.7, 1 CPU, elapsed seconds
+
+    n = m    nested      hash     merge
+      100     0.001     0.000     0.000
+     1000     0.065     0.001     0.001
+     5000     1.318     0.002     0.003
+   100000         -     0.111     0.097
+  1000000         -     1.302     0.764
+
+The nested loop grows with n * m (5x rows -> 20x time),
+while the hash join and the sort-merge join grow almost linearly.
+The sort-merge join wins here only because `sorted()` is linear
+for the already (reversely) sorted ids of this benchmark;
+for shuffled rows it pays O(n log n) for sorting.
+With `presorted=True` both sides are streamed,
+and the hash join streams only the probe side (`left`).
+"""
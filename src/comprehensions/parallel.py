@@ -0,0 +1,278 @@
+import math
+import os
+import time
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Any
+
+# arrays of this size or larger are passed through shared memory
+SHARED_MEMORY_THRESHOLD = 1 << 20
+
+# shared memory blocks attached by a worker process, by name
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _map_chunk(f: Callable, chunk: list) -> list:
+    return list(map(f, chunk))
+
+
+def _filter_chunk(predicate: Callable, chunk: list) -> list:
+    return list(filter(predicate, chunk))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # workers share the resource tracker of the parent,
+    # which unlinks the block only once, when the parent unlinks it
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _attached[name] = shared_memory.SharedMemory(name)
+    return shm
+
+
+def _map_shared(f: Callable, chunk: tuple[str, str, int, int]) -> list:
+    "map `[start:stop]` of a shared `array` without pickling the elements"
+    name, typecode, start, stop = chunk
+    with _attach(name).buf.cast(typecode) as xs:
+        return list(map(f, xs[start:stop]))
+
+
+def _chunksize(n: int | None, workers: int) -> int:
+    "about 4 chunks per worker to balance load; 256 for unsized iterables"
+    if n is None:
+        return 256
+    return max(1, math.ceil(n / (workers * 4)))
+
+
+def _in_order(
+    executor: Executor,
+    fn: Callable,
+    f: Callable,
+    chunks: Iterator[list],
+    max_pending: int,
+) -> Iterator[list]:
+    "results of chunks in the input order with at most `max_pending` futures"
+    pending: deque[Future] = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(fn, f, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _run(
+    fn: Callable,
+    f: Callable,
+    chunks: Iterator,
+    workers: int,
+) -> Iterator:
+    with ProcessPoolExecutor(workers) as executor:
+        for res in _in_order(executor, fn, f, chunks, workers * 2):
+            yield from res
+
+
+def _parallel(
+    fn: Callable,
+    f: Callable,
+    iterable: Iterable,
+    workers: int | None,
+    chunksize: int | None,
+    stream: bool,
+) -> list | Iterator:
+    workers = workers or os.cpu_count() or 1
+    n = len(iterable) if hasattr(iterable, "__len__") else None
+    chunksize = chunksize or _chunksize(n, workers)
+
+    it = iter(iterable)
+    chunks = iter(lambda: list(islice(it, chunksize)), [])
+
+    res = _run(fn, f, chunks, workers)
+    return res if stream else list(res)
+
+
+def _parallel_map_shared(
+    f: Callable,
+    xs: array,
+    workers: int | None,
+    chunksize: int | None,
+    stream: bool,
+) -> list | Iterator:
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or _chunksize(len(xs), workers)
+
+    def run() -> Iterator:
+        nbytes = len(xs) * xs.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            shm.buf[:nbytes] = memoryview(xs).cast("B")
+            chunks = (
+                (shm.name, xs.typecode, start, min(start + chunksize, len(xs)))
+                for start in range(0, len(xs), chunksize)
+            )
+            yield from _run(_map_shared, f, chunks, workers)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    res = run()
+    return res if stream else list(res)
+
+
+def parallel_map(
+    f: Callable[[Any], Any],
+    iterable: Iterable,
+    workers: int | None = None,
+    chunksize: int | None = None,
+    stream: bool = False,
+) -> list | Iterator:
+    """`list(map(f, iterable))` on a process pool, keeping the order.
+
+    Elements are sent to workers in chunks. The chunk size is chosen
+    for about 4 chunks per worker if not given. Only `workers * 2` chunks
+    are in flight at a time, so an iterable is consumed lazily.
+
+    `f` must be picklable, i.e. a function defined at the top level
+    of a module; lambdas can't be used.
+
+    Args:
+        f (Callable): a function applied to each element
+        iterable (Iterable): elements; an `array.array` of
+            `SHARED_MEMORY_THRESHOLD` bytes or more is passed to workers
+            through shared memory instead of pickling its elements;
+            the block is freed when all results are consumed
+        workers (int | None): the number of processes; CPUs if None
+        chunksize (int | None): elements per task
+        stream (bool): returns a generator of results instead of a list
+
+    Returns:
+        list | Iterator: results in the input order
+    """
+    if isinstance(iterable, array) \
+            and len(iterable) * iterable.itemsize >= SHARED_MEMORY_THRESHOLD:
+        return _parallel_map_shared(f, iterable, workers, chunksize, stream)
+    return _parallel(_map_chunk, f, iterable, workers, chunksize, stream)
+
+
+def parallel_filter(
+    predicate: Callable[[Any], bool],
+    iterable: Iterable,
+    workers: int | None = None,
+    chunksize: int | None = None,
+    stream: bool = False,
+) -> list | Iterator:
+    "`list(filter(predicate, iterable))` on a process pool; see `parallel_map`"
+    return _parallel(
+        _filter_chunk, predicate, iterable, workers, chunksize, stream)
+
+
+def square(x: int) -> int:
+    return x ** 2
+
+
+def is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+# workers of a process pool import this module again
+# unless they are forked (spawn on macOS and Windows)
+if __name__ == "__main__":
+    a = [1, 2, 3, 4, 5]
+
+    print(parallel_map(square, a, workers=2))   # [1, 4, 9, 16, 25]
+    print(parallel_filter(is_even, a, workers=2))    # [2, 4]
+
+    # results as they are ready, in the input order
+    for x in parallel_map(square, iter(a), workers=2, stream=True):
+        print(x, end=" ")   # 1 4 9 16 25
+    print()
+
+    # large arrays are not pickled
+    xs = array("q", range(SHARED_MEMORY_THRESHOLD // 8))
+    print(parallel_map(square, xs, workers=2)[-1])   # 17179607041
+    # results are pickled back as a list of any type
+    print(parallel_map(math.sqrt, xs, workers=2)[-1])   # 362.03729089694616
+
+
+# benchmark
+def work(x: int) -> int:
+    "CPU-bound work for each element"
+    for _ in range(200):
+        x = (x * x + 1) % 1_000_003
+    return x
+
+
+if __name__ == "__main__":
+    n = 20_000
+    numbers = list(range(n))
+    cpus = os.cpu_count() or 1
+
+    print(f"{'':>24} {'workers':>7} {'seconds':>8} {'speedup':>7}")
+    start = time.perf_counter()
+    expected = [work(x) for x in numbers]
+    baseline = time.perf_counter() - start
+    print(f"{'comprehension':>24} {1:>7} {baseline:8.3f} {1:7.2f}")
+
+    start = time.perf_counter()
+    list(map(work, numbers))
+    elapsed = time.perf_counter() - start
+    print(f"{'map()':>24} {1:>7} {elapsed:8.3f} {baseline / elapsed:7.2f}")
+
+    for workers in sorted({1, 2, 4, cpus}):
+        for name, data in [
+            ("parallel_map(list)", numbers),
+            # 8x elements to be above `SHARED_MEMORY_THRESHOLD`
+            ("parallel_map(array)", array("q", numbers * 8)),
+        ]:
+            start = time.perf_counter()
+            res = parallel_map(work, data, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert list(res[:n]) == expected
+            if isinstance(data, array):
+                elapsed /= 8
+            print(f"{name:>24} {workers:>7} {elapsed:8.3f}"
+                  f" {baseline / elapsed:7.2f}")
+
+    # cheap work; moving elements dominates
+    numbers = list(range(2_000_000))
+    print(f"{'square()':>24} {'workers':>7} {'seconds':>8}")
+    for name, data in [
+        ("comprehension", None),
+        ("parallel_map(list)", numbers),
+        ("parallel_map(array)", array("q", numbers)),
+    ]:
+        start = time.perf_counter()
+        if data is None:
+            [square(x) for x in numbers]
+        else:
+            parallel_map(square, data, workers=2)
+        print(f"{name:>24} {1 if data is None else 2:>7}"
+              f" {time.perf_counter() - start:8.3f}")
+
+"""
+Python 3.11.7, 1 CPU, 20000 elements x 200 iterations of `work()`
+
+                         workers  seconds speedup
+           comprehension       1    0.352    1.00
+                   map()       1    0.429    0.82
+      parallel_map(list)       1    0.401    0.88
+     parallel_map(array)       1    0.362    0.97
+      parallel_map(list)       2    0.384    0.92
+     parallel_map(array)       2    0.367    0.96
+      parallel_map(list)       4    0.407    0.87
+     parallel_map(array)       4    0.401    0.88
+                square() workers  seconds
+           comprehension       1    0.264
+      parallel_map(list)       2    0.904
+     parallel_map(array)       2    0.723
+
+With 1 CPU, workers just take turns, so there is no speedup;
+the results show the overhead of processes, which is ~10% here.
+On N CPUs, CPU-bound work like `work()` is expected to scale up to ~N x.
+When the work per element is cheap like `square()`, moving elements
+dominates; shared memory saves pickling the input,
+but results are pickled back and a comprehension still wins.
+"""
@@ -0,0 +1,286 @@
+import io
+import json
+import math
+import random
+import time
+import tracemalloc
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash64(name: str) -> int:
+    # `hash()` of `str` is SipHash, randomized per process;
+    # sketches built in different processes cannot be merged
+    return hash(name) & _MASK64
+
+
+class HyperLogLog:
+    """Estimate the number of distinct names with `2 ** precision` bytes.
+
+    The standard error is `1.04 / sqrt(2 ** precision)`, 0.8% for 14.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add_hash(self, h: int) -> None:
+        p = self.precision
+        i = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        # position of the leftmost 1 bit in the rest bits
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[i]:
+            self.registers[i] = rank
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        e = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if e <= 2.5 * m and zeros:
+            # linear counting is more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return e
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+
+class CountMinSketch:
+    """Estimate sums of non-negative values by name in `width * depth` cells.
+
+    An estimate is never less than the true sum, and it exceeds the true sum
+    by at most `e / width * total` with probability `1 - e ** -depth`.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self.total = 0.0
+        self.rows = [array("d", bytes(8 * width)) for _ in range(depth)]
+
+    def indices(self, h: int) -> list[int]:
+        "a cell in each row; sketches of the same shape share indices"
+        # Kirsch-Mitzenmacher; `depth` hashes from the two halves of `h`
+        h1, h2, width = h & 0xFFFFFFFF, h >> 32, self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add_at(self, indices: list[int], value: float = 1) -> None:
+        self.total += value
+        for row, i in zip(self.rows, indices):
+            row[i] += value
+
+    def estimate_at(self, indices: list[int]) -> float:
+        return min(row[i] for row, i in zip(self.rows, indices))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(row.itemsize * len(row) for row in self.rows)
+
+    @property
+    def error_bound(self) -> float:
+        return math.e / self.width * self.total
+
+    @property
+    def confidence(self) -> float:
+        return 1 - math.exp(-self.depth)
+
+
+class CartAggregator:
+    """Distinct names with their counts and price totals over a stream.
+
+    Names are aggregated exactly in a dict until more than `max_exact`
+    distinct names are seen. Then the aggregator switches to sketches
+    of fixed size: `HyperLogLog` for the number of distinct names and
+    `CountMinSketch`es for counts and totals by name.
+
+    Args:
+        max_exact (int): the max number of distinct names kept exactly
+        precision (int): the precision of `HyperLogLog`
+        width (int): the width of `CountMinSketch`es
+        depth (int): the depth of `CountMinSketch`es
+    """
+
+    def __init__(
+        self,
+        max_exact: int = 100_000,
+        precision: int = 14,
+        width: int = 1 << 16,
+        depth: int = 4,
+    ) -> None:
+        self.max_exact = max_exact
+        self.items = 0
+        # name -> [count, total]
+        self.exact: dict[str, list] | None = {}
+        self.distinct = HyperLogLog(precision)
+        self.counts = CountMinSketch(width, depth)
+        self.totals = CountMinSketch(width, depth)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.exact is not None
+
+    def add(self, name: str, price: float) -> None:
+        self.items += 1
+        if self.exact is not None:
+            stats = self.exact.get(name)
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += price
+                return
+            if len(self.exact) < self.max_exact:
+                self.exact[name] = [1, price]
+                return
+            self._to_sketches()
+
+        self._add_to_sketches(name, 1, price)
+
+    def _add_to_sketches(self, name: str, count: int, total: float) -> None:
+        h = _hash64(name)
+        self.distinct.add_hash(h)
+        indices = self.counts.indices(h)
+        self.counts.add_at(indices, count)
+        self.totals.add_at(indices, total)
+
+    def _to_sketches(self) -> None:
+        assert self.exact is not None
+        for name, (count, total) in self.exact.items():
+            self._add_to_sketches(name, count, total)
+        self.exact = None
+
+    def update(self, items: Iterable[dict]) -> "CartAggregator":
+        add = self.add
+        for item in items:
+            add(item["name"], item["price"])
+        return self
+
+    def names(self) -> set[str]:
+        "distinct names; only available in the exact mode"
+        if self.exact is None:
+            raise ValueError("names are not kept after switching to sketches")
+        return set(self.exact)
+
+    def num_distinct(self) -> float:
+        if self.exact is not None:
+            return len(self.exact)
+        return self.distinct.estimate()
+
+    def stats(self, name: str) -> tuple[float, float]:
+        "count and total price of `name`; upper bounds in the sketch mode"
+        if self.exact is not None:
+            count, total = self.exact.get(name, (0, 0))
+            return count, total
+        indices = self.counts.indices(_hash64(name))
+        return self.counts.estimate_at(indices), \
+            self.totals.estimate_at(indices)
+
+    def nbytes(self) -> int:
+        "memory of the sketches, fixed regardless of the number of names"
+        return len(self.distinct.registers) \
+            + self.counts.nbytes + self.totals.nbytes
+
+    def error_bounds(self) -> dict[str, float]:
+        "0 in the exact mode, which holds with probability 1"
+        if self.exact is not None:
+            return {
+                "distinct": 0.0, "count": 0.0, "total": 0.0, "confidence": 1.0}
+        return {
+            # relative standard error
+            "distinct": self.distinct.relative_error,
+            # absolute overestimates with probability `confidence`
+            "count": self.counts.error_bound,
+            "total": self.totals.error_bound,
+            "confidence": self.counts.confidence,
+        }
+
+
+def read_json_lines(file: IO[str]) -> Iterator[dict]:
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+shopping_cart = io.StringIO("""\
+{"name": "apple", "price": 100}
+{"name": "orange", "price": 200}
+{"name": "orange", "price": 200}
+{"name": "grape", "price": 300}
+{"name": "apple", "price": 100}
+""")
+
+aggregator = CartAggregator().update(read_json_lines(shopping_cart))
+print(aggregator.names())   # {'apple', 'orange', 'grape'}
+print(aggregator.stats("orange"))   # (2, 400)
+
+
+# benchmark
+def make_items(n: int, k: int) -> Iterator[dict]:
+    "`n` items of `k` names; a few names are much more frequent than others"
+    rand = random.Random(0)
+    for _ in range(n):
+        i = int(k ** rand.random()) - 1
+        yield {"name": f"fruit{i}", "price": 100 + i % 10 * 100}
+
+
+n, k = 1_000_000, 300_000
+items = list(make_items(n, k))
+
+
+def measure(f: Callable[[], Any]) -> tuple[Any, float, float]:
+    "the result, items/s and MB allocated"
+    start = time.perf_counter()
+    f()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    res = f()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, n / elapsed, size / 1e6
+
+
+print(f"{'':>18} {'items/s':>10} {'MB':>6}")
+fruits, rate, size = measure(lambda: {item["name"] for item in items})
+print(f"{'set comprehension':>18} {rate:10,.0f} {size:6.1f}")
+exact, rate, size = measure(lambda: CartAggregator(max_exact=k).update(items))
+print(f"{'exact':>18} {rate:10,.0f} {size:6.1f}")
+sketch, rate, size = measure(
+    lambda: CartAggregator(max_exact=10_000).update(items))
+print(f"{'sketches':>18} {rate:10,.0f} {size:6.1f}")
+
+bounds = sketch.error_bounds()
+estimated = sketch.num_distinct()
+print(f"distinct: {len(fruits)}, estimated {estimated:.0f}"
+      f" ({estimated / len(fruits) - 1:+.2%}"
+      f", std error {bounds['distinct']:.2%})")
+for i, key in enumerate(["count", "total"]):
+    errors = [sketch.stats(name)[i] - exact.stats(name)[i] for name in fruits]
+    within = sum(e <= bounds[key] for e in errors) / len(errors)
+    print(f"{key} overestimate: mean {sum(errors) / len(errors):.1f}"
+          f", max {max(errors):.0f}")
+    print(f"  bound {bounds[key]:.0f} for {within:.1%} of names"
+          f" (expected >= {bounds['confidence']:.1%})")
+
+"""
+Python 3.11.7, 1 CPU, 1000000 items of 300000 possible names
+
+                      items/s     MB
+ set comprehension  5,506,175    4.2
+             exact  1,075,817   21.2
+          sketches    156,391    4.5
+distinct: 148967, estimated 148838 (-0.09%, std error 0.81%)
+count overestimate: mean 1.3, max 42
+  bound 41 for 100.0% of names (expected >= 98.2%)
+total overestimate: mean 635.4, max 19700
+  bound 21171 for 100.0% of names (expected >= 98.2%)
+
+The set comprehension only dedups; counts and totals cost a dict of lists.
+The sketches stay 4.5 MB however many names are seen,
+trading exact answers and throughput (hashing per item in Python) for it.
+The distinct estimate varies between runs since `hash()` is randomized.
+"""
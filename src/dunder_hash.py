@@ -0,0 +1,124 @@
+import random
+import time
+from typing import Any
+
+
+class User:
+    """`User` of `src/dunder_methods.py` usable as keys of dicts and sets.
+
+    Equal users must have equal hashes, and a hash must not change
+    while the object is in a dict or a set,
+    so `id` and `name` are read-only and the hash is computed once.
+    """
+    __slots__ = ("_id", "_name", "_hash")
+
+    def __init__(self, id: int, name: str) -> None:
+        self._id = id
+        self._name = name
+        self._hash = hash((id, name))
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id}, name={self.name})"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        "users are equal if their `id` and `name` are equal"
+        if not isinstance(other, User):
+            # let Python try `other.__eq__()`, then compare identities
+            return NotImplemented
+
+        return self._hash == other._hash \
+            and self._id == other._id and self._name == other._name
+
+    def __hash__(self) -> int:
+        "defining the hash value used by dicts and sets"
+        return self._hash
+
+
+alice = User(id=1, name="alice")
+another_alice = User(id=1, name="alice")
+
+print(alice == another_alice)   # True
+print(alice is another_alice)   # False
+print(hash(alice) == hash(another_alice))   # True
+
+
+# set comprehension; duplicates are removed
+users = [alice, User(2, "bob"), another_alice, User(3, "eve")]
+print({user for user in users})
+# {User(id=1, name=alice), User(id=2, name=bob), User(id=3, name=eve)}
+
+# dict comprehension with users as keys
+logins = {user: 0 for user in users}
+logins[another_alice] += 1
+print(logins[alice])    # 1
+
+# objects of other types are just not equal
+print(alice == 1)   # False
+print(alice == "alice")  # False
+
+# alice.name = "eve"
+# AttributeError: property 'name' of 'User' object has no setter
+
+
+# benchmark
+def dedup_by_list(users: list[User]) -> list[User]:
+    res: list[User] = []
+    for user in users:
+        if user not in res:
+            res.append(user)
+    return res
+
+
+def dedup_by_set(users: list[User]) -> set[User]:
+    return set(users)
+
+
+def dedup_by_dict(users: list[User]) -> list[User]:
+    "keeping the order of first occurrences"
+    return list(dict.fromkeys(users))
+
+
+random.seed(0)
+print(f"{'users':>10} {'list':>9} {'set':>9} {'dict':>9}  (seconds)")
+for n in [1_000, 10_000, 100_000, 10_000_000]:
+    # about a half of users are duplicates
+    ids = [random.randrange(n // 2) for _ in range(n)]
+    users = [User(id, f"user{id}") for id in ids]
+
+    elapsed = []
+    for dedup in [dedup_by_list, dedup_by_set, dedup_by_dict]:
+        if dedup is dedup_by_list and n > 10_000:
+            elapsed.append(f"{'-':>9}")
+            continue
+        start = time.perf_counter()
+        unique = dedup(users)
+        elapsed.append(f"{time.perf_counter() - start:9.3f}")
+        assert len(unique) == len(set(ids))
+    print(f"{n:>10} {' '.join(elapsed)}")
+    del ids, users, unique
+
+"""
+Python 3.11.7, 1 CPU, about a half of users are duplicates
+
+     users      list       set      dict  (seconds)
+      1000     0.070     0.000     0.000
+     10000     2.055     0.003     0.004
+    100000         -     0.043     0.047
+  10000000         -     8.619    11.189
+
+Deduplicating by a list is O(n^2); 10x users take 30x time.
+The list takes hours for 10000000 users, while a set takes seconds
+since the cached hash finds candidates without comparing users,
+and `__eq__()` runs only for users with equal hashes.
+"""
@@ -0,0 +1,108 @@
+import random
+import time
+from collections.abc import Iterable
+from enum import Enum
+from functools import reduce
+from operator import or_
+
+
+class Permission(Enum):
+    READ = "read"
+    WRITE = "write"
+    EXECUTE = "execute"
+
+    @classmethod
+    def from_value(cls, value: str) -> "Permission":
+        "same as `Permission(value)` with one dict lookup"
+        try:
+            return _BY_VALUE[value]
+        except KeyError:
+            raise ValueError(
+                f"{value!r} is not a valid {cls.__name__}") from None
+
+    @classmethod
+    def from_name(cls, name: str) -> "Permission":
+        "same as `Permission[name]` with one dict lookup"
+        return _BY_NAME[name]
+
+    @classmethod
+    def decode(cls, values: Iterable[str]) -> list["Permission"]:
+        "same as `[Permission(v) for v in values]` without a Python loop"
+        try:
+            return list(map(_BY_VALUE.__getitem__, values))
+        except KeyError as e:
+            raise ValueError(
+                f"{e.args[0]!r} is not a valid {cls.__name__}") from None
+
+    @classmethod
+    def decode_mask(cls, values: Iterable[str]) -> int:
+        "bitwise OR of the bits of the members of `values`"
+        try:
+            return reduce(or_, map(_MASK_BY_VALUE.__getitem__, values), 0)
+        except KeyError as e:
+            raise ValueError(
+                f"{e.args[0]!r} is not a valid {cls.__name__}") from None
+
+    @property
+    def mask(self) -> int:
+        return _MASK_BY_VALUE[self.value]
+
+
+# tables can't be class attributes since they would become members
+_BY_VALUE: dict[str, Permission] = {p.value: p for p in Permission}
+_BY_NAME: dict[str, Permission] = {p.name: p for p in Permission}
+_MASK_BY_VALUE: dict[str, int] = {
+    p.value: 1 << i for i, p in enumerate(Permission)}
+
+
+r = Permission.from_value("read")
+
+# members are the same objects as the ones by `Enum`
+print(r is Permission("read"))  # True
+print(Permission.from_name("READ") is Permission["READ"])    # True
+print(r.name, r.value)  # READ read
+print(r in Permission)  # True
+print(list(Permission))
+# [<Permission.READ: 'read'>, <Permission.WRITE: 'write'>, <Permission.EXECUTE: 'execute'>] # noqa E501
+
+print(Permission.decode(["read", "execute"]))
+# [<Permission.READ: 'read'>, <Permission.EXECUTE: 'execute'>]
+
+mask = Permission.decode_mask(["read", "execute"])
+print(bin(mask))    # 0b101
+print(bool(mask & Permission.WRITE.mask))   # False
+
+# Permission.from_value("delete")
+# ValueError: 'delete' is not a valid Permission
+
+
+# benchmark
+n = 1_000_000
+random.seed(0)
+values = [random.choice(["read", "write", "execute"]) for _ in range(n)]
+
+print(f"{'decode':>32} {'M values/s':>10}")
+for name, decode in [
+    ("[Permission(v) for v in values]",
+     lambda: [Permission(v) for v in values]),
+    ("[from_value(v) for v in values]",
+     lambda: [Permission.from_value(v) for v in values]),
+    ("decode(values)", lambda: Permission.decode(values)),
+    ("decode_mask(values)", lambda: Permission.decode_mask(values)),
+]:
+    start = time.perf_counter()
+    decode()
+    print(f"{name:>32} {n / (time.perf_counter() - start) / 1e6:10.1f}")
+
+"""
+Python 3.11.7, 1 CPU, 1000000 values
+
+                          decode M values/s
+ [Permission(v) for v in values]        1.5
+ [from_value(v) for v in values]        3.8
+                  decode(values)       30.0
+             decode_mask(values)       18.1
+
+`Permission(v)` goes through `EnumType.__call__()` and `Enum.__new__()`.
+`decode()` maps `dict.__getitem__` over the values, all in C.
+"""
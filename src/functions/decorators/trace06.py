@@ -0,0 +1,237 @@
+import contextlib
+import functools
+import io
+import threading
+import time
+import timeit
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, ParamSpecArgs, ParamSpecKwargs
+
+# (function, called at, returned at, args, kwargs, return value)
+# times are `time.monotonic_ns()`
+TraceEvent = tuple[Callable, int, int, tuple, dict, Any]
+
+
+def fmt_f_call(f: Callable, *args, **kwargs) -> str:
+    args_s = ", ".join([str(arg) for arg in args])
+    kwargs_s = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
+
+    return f"{f.__name__}({args_s if args else ''}"\
+        f"{', ' if (args and kwargs) else '' }{kwargs_s if kwargs else ''})"
+
+
+def fmt_f_return(f: Callable, return_value: Any, *args, **kwargs) -> str:
+    return f"{fmt_f_call(f, *args, **kwargs)} returned `{return_value}`"
+
+
+# offset to convert `time.monotonic_ns()` into epoch nanoseconds
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def fmt_event(event: TraceEvent) -> str:
+    f, called_at, returned_at, args, kwargs, res = event
+    called_dt = datetime.fromtimestamp((called_at + _EPOCH_OFFSET_NS) / 1e9)
+    returned_dt = datetime.fromtimestamp(
+        (returned_at + _EPOCH_OFFSET_NS) / 1e9)
+
+    return f"{called_dt} | {fmt_f_call(f, *args, **kwargs)}\n"\
+        f"{returned_dt} | {fmt_f_return(f, res, *args, **kwargs)}"
+
+
+class TraceBuffer:
+    """A bounded buffer of raw trace events formatted lazily.
+
+    Traced calls only append a tuple to the buffer;
+    `str()` of the arguments, datetime conversion and writing are done
+    when the buffer is flushed, either by calling `flush()`
+    or by a background thread started with `start()`.
+
+    The buffer is a `deque` with `maxlen`, which is a ring buffer:
+    `append()` never allocates more than `size` slots
+    and is safe to call from multiple threads.
+    If the buffer is not flushed in time, the oldest events are overwritten.
+
+    Notice that arguments are formatted when flushed, not when called,
+    so mutating them after the call changes the trace.
+
+    Args:
+        size (int): the max number of events kept
+        fmter (Callable[[TraceEvent], str]): a function to format an event
+        writer (Callable[[str], Any]): a function to write formatted events
+    """
+
+    def __init__(
+        self,
+        size: int = 65536,
+        fmter: Callable[[TraceEvent], str] = fmt_event,
+        writer: Callable[[str], Any] = print,
+    ) -> None:
+        self.events: deque[TraceEvent] = deque(maxlen=size)
+        self.fmter = fmter
+        self.writer = writer
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def flush(self) -> None:
+        popleft = self.events.popleft
+        # `popleft()` is atomic, but checking `events` first is not;
+        # another thread may flush it empty in between
+        while True:
+            try:
+                event = popleft()
+            except IndexError:
+                return
+            self.writer(self.fmter(event))
+
+    def start(self, interval: float = 0.1) -> None:
+        "flush the buffer every `interval` seconds on a background thread"
+        def run() -> None:
+            while not self._stopped.wait(interval):
+                self.flush()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        "stop the background thread if started and flush the rest"
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+class trace:
+    """Modify the given function `f`
+    to record the call into `buffer` instead of printing it.
+
+    Args:
+        buffer (TraceBuffer): a buffer to record calls
+
+    Returns:
+        Callable: a modified function
+    """
+
+    def __init__(self, buffer: TraceBuffer) -> None:
+        self.buffer = buffer
+
+    def __call__(self, f: Callable) -> Callable:
+        record = self.buffer.events.append
+        monotonic_ns = time.monotonic_ns
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs) -> Any:
+            called_at = monotonic_ns()
+            res = f(*args, **kwargs)
+            record((f, called_at, monotonic_ns(), args, kwargs, res))
+
+            return res
+        return wrapper
+
+
+class print_trace:
+    "`trace` of `trace05.py` printing twice per call"
+
+    def __init__(
+        self,
+        f_call_fmter: Callable[
+            [Callable, ParamSpecArgs, ParamSpecKwargs], str],
+        f_return_fmter:
+        Callable[[Callable, Any, ParamSpecArgs, ParamSpecKwargs], str],
+    ) -> None:
+        self.f_call_fmter = f_call_fmter
+        self.f_return_fmter = f_return_fmter
+
+    def __call__(self, f: Callable) -> Callable:
+        def wrapper(*args, **kwargs) -> Any:
+            print(self.f_call_fmter(f, *args, **kwargs))
+
+            res = f(*args, **kwargs)
+
+            print(self.f_return_fmter(f, res, *args, **kwargs))
+
+            return res
+        return wrapper
+
+
+buffer = TraceBuffer()
+
+
+@trace(buffer)
+def one() -> int:
+    return 1
+
+
+@trace(buffer)
+def eq_name(name1: str, name2: str, case_sensitive: bool = True) -> bool:
+    if case_sensitive:
+        return name1 == name2
+
+    return name1.lower() == name2.lower()
+
+
+one()
+eq_name("alice", "Alice", case_sensitive=False)
+# nothing printed yet
+
+buffer.flush()
+# 2023-02-02 01:15:59.180540 | one()
+# 2023-02-02 01:15:59.180541 | one() returned `1`
+# 2023-02-02 01:15:59.180592 | eq_name(alice, Alice, case_sensitive=False)
+# 2023-02-02 01:15:59.180593 | eq_name(alice, Alice, case_sensitive=False) returned `True` # noqa: E501
+
+
+# flushing on a background thread
+buffer.start(interval=0.1)
+one()
+time.sleep(0.2)
+# 2023-02-02 01:15:59.180600 | one()
+# 2023-02-02 01:15:59.180601 | one() returned `1`
+buffer.close()
+
+
+# benchmark
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+n = 200_000
+out = io.StringIO()
+benchmark_buffer = TraceBuffer(size=n, writer=out.write)
+
+untraced_add = add
+print_traced_add = print_trace(fmt_f_call, fmt_f_return)(add)
+buffer_traced_add = trace(benchmark_buffer)(add)
+
+print(f"{'path':>12} {'ns/call':>8}")
+for name, f in [
+    ("untraced", untraced_add),
+    ("print", print_traced_add),
+    ("buffered", buffer_traced_add),
+]:
+    # discard printed lines not to measure the terminal
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = timeit.timeit(lambda: f(1, 2), number=n)
+    print(f"{name:>12} {elapsed / n * 1e9:8.0f}")
+
+start = time.perf_counter()
+benchmark_buffer.flush()
+elapsed = time.perf_counter() - start
+print(f"{'flush':>12} {elapsed / n * 1e9:8.0f}")
+
+"""
+Python 3.11.7, 1 CPU, `add(1, 2)` traced
+
+        path  ns/call
+    untraced       89
+       print     5283
+    buffered      534
+       flush     9869
+
+The buffered path only reads the clock twice and appends a tuple,
+about 10x cheaper than the print path.
+Formatting is not free, it just moves to `flush()`,
+which can run on a background thread or be skipped for discarded events.
+"""
@@ -0,0 +1,230 @@
+import contextlib
+import functools
+import io
+import random
+import time
+import timeit
+from datetime import datetime
+from itertools import cycle
+from typing import Any, Callable, ParamSpecArgs, ParamSpecKwargs
+
+
+def fmt_f_call(f: Callable, *args, **kwargs) -> str:
+    args_s = ", ".join([str(arg) for arg in args])
+    kwargs_s = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
+
+    return f"{f.__name__}({args_s if args else ''}"\
+        f"{', ' if (args and kwargs) else '' }{kwargs_s if kwargs else ''})"
+
+
+def fmt_f_return(f: Callable, return_value: Any, *args, **kwargs) -> str:
+    return f"{fmt_f_call(f, *args, **kwargs)} returned `{return_value}`"
+
+
+def fmt_f_call_with_dt(f: Callable, *args, **kwargs) -> str:
+    return f"{datetime.now()} | {fmt_f_call(f, *args, **kwargs)}"
+
+
+def fmt_f_return_with_dt(
+    f: Callable, return_value: Any,
+    *args,
+    **kwargs,
+) -> str:
+    return f"{datetime.now()} |"\
+        f" {fmt_f_return(f, return_value, *args, **kwargs)}"
+
+
+class EveryNth:
+    "trace the 1st call of every `n` calls"
+
+    def __init__(self, n: int) -> None:
+        if n < 1:
+            raise ValueError("`n` must be positive")
+        self.n = n
+
+    def sampler(self) -> Callable[[], bool]:
+        # `cycle.__next__` runs in C; no Python frame per call
+        return cycle([True] + [False] * (self.n - 1)).__next__
+
+
+class Probabilistic:
+    "trace each call with the probability `p`"
+
+    def __init__(self, p: float) -> None:
+        if not 0 <= p <= 1:
+            raise ValueError("`p` must be in [0, 1]")
+        self.p = p
+
+    def sampler(self) -> Callable[[], bool]:
+        p = self.p
+        rand = random.random
+        return lambda: rand() < p
+
+
+class TokenBucket:
+    """trace at most `burst` calls at once
+    and `rate` calls per second on average.
+
+    Within `t` seconds, at most `burst + rate * t` calls are traced
+    however often the function is called,
+    which bounds the cost of tracing under load.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("`rate` and `burst` must be positive")
+        self.rate = rate
+        self.burst = burst
+
+    def sampler(self) -> Callable[[], bool]:
+        # GCRA, an equivalent of the token bucket keeping one timestamp.
+        # a call is rejected with one clock read and one comparison.
+        interval = 1 / self.rate
+        tolerance = (self.burst - 1) * interval
+        monotonic = time.monotonic
+        # theoretical arrival time of the next call
+        tat = monotonic()
+
+        def sample() -> bool:
+            nonlocal tat
+            now = monotonic()
+            if now < tat - tolerance:
+                return False
+            tat = max(tat, now) + interval
+            return True
+        return sample
+
+
+Sampling = EveryNth | Probabilistic | TokenBucket
+
+
+class trace:
+    """Modify the given function `f`
+    to print some information on the function
+    before calling and after returned,
+    only for calls chosen by `sampling`.
+
+    Args:
+        f_call_fmter
+        (Callable[[Callable, ParamSpecArgs, ParamSpecKwargs], str]):
+        a function to format information printed before function calling.
+        the function should take `*args` and `*kwargs` and return a string.
+
+        f_return_fmter
+        (Callable[[Callable, Any, ParamSpecArgs, ParamSpecKwargs], str]):
+        a function to format information printed after function returned.
+        the function should take the return value, `*args` and `**kwargs`
+        and return a string.
+
+        sampling (Sampling | None): a policy to choose calls to trace.
+        each decorated function has its own state of the policy,
+        e.g. its own token bucket.
+        all calls are traced if `None`.
+
+    Returns:
+        Callable: a modified function
+    """
+
+    def __init__(
+        self,
+        f_call_fmter: Callable[
+            [Callable, ParamSpecArgs, ParamSpecKwargs], str],
+        f_return_fmter:
+        Callable[[Callable, Any, ParamSpecArgs, ParamSpecKwargs], str],
+        sampling: Sampling | None = None,
+    ) -> None:
+        self.f_call_fmter = f_call_fmter
+        self.f_return_fmter = f_return_fmter
+        self.sampling = sampling
+
+    def __call__(self, f: Callable) -> Callable:
+        f_call_fmter = self.f_call_fmter
+        f_return_fmter = self.f_return_fmter
+        sample = self.sampling.sampler() if self.sampling else None
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs) -> Any:
+            # skip formatting entirely for calls not sampled
+            if sample is not None and not sample():
+                return f(*args, **kwargs)
+
+            print(f_call_fmter(f, *args, **kwargs))
+
+            res = f(*args, **kwargs)
+
+            print(f_return_fmter(f, res, *args, **kwargs))
+
+            return res
+        return wrapper
+
+
+@trace(fmt_f_call, fmt_f_return, EveryNth(2))
+def one() -> int:
+    return 1
+
+
+@trace(fmt_f_call_with_dt, fmt_f_return_with_dt, TokenBucket(rate=1))
+def eq_name(name1: str, name2: str, case_sensitive: bool = True) -> bool:
+    if case_sensitive:
+        return name1 == name2
+
+    return name1.lower() == name2.lower()
+
+
+one()
+# one()
+# one() returned `1`
+one()   # not traced
+one()
+# one()
+# one() returned `1`
+
+eq_name("alice", "Alice", case_sensitive=False)
+# 2023-02-02 01:15:59.180540 | eq_name(alice, Alice, case_sensitive=False)
+# 2023-02-02 01:15:59.180592 | eq_name(alice, Alice, case_sensitive=False) returned `True` # noqa: E501
+eq_name("alice", "Alice", case_sensitive=False)  # not traced; no token left
+
+
+# benchmark
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+n = 200_000
+
+print(f"{'sampling':>24} {'traced':>8} {'ns/call':>8}")
+for name, sampling in [
+    ("untraced", None),
+    ("all", None),
+    ("EveryNth(10)", EveryNth(10)),
+    ("EveryNth(100)", EveryNth(100)),
+    ("EveryNth(10000)", EveryNth(10000)),
+    ("Probabilistic(0.01)", Probabilistic(0.01)),
+    ("TokenBucket(1000, 100)", TokenBucket(rate=1000, burst=100)),
+]:
+    f = add if name == "untraced" \
+        else trace(fmt_f_call, fmt_f_return, sampling)(add)
+    out = io.StringIO()
+    # discard printed lines not to measure the terminal
+    with contextlib.redirect_stdout(out):
+        elapsed = timeit.timeit(lambda: f(1, 2), number=n)
+    traced = out.getvalue().count("\n") // 2
+    print(f"{name:>24} {traced:>8} {elapsed / n * 1e9:8.0f}")
+
+"""
+Python 3.11.7, 1 CPU, 200000 calls of `add(1, 2)`
+
+                sampling   traced  ns/call
+                untraced        0      109
+                     all   200000     6376
+            EveryNth(10)    20000     1037
+           EveryNth(100)     2000      503
+         EveryNth(10000)       20      452
+     Probabilistic(0.01)     1960      609
+  TokenBucket(1000, 100)      226      634
+
+A call not sampled costs the wrapper and one sampler call (~350-500ns),
+so the overhead approaches that floor as the sampling rate drops.
+`TokenBucket` traced 226 calls in ~0.13s (`burst + rate * t`)
+regardless of the number of calls, which bounds the cost under load.
+"""
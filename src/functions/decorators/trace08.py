@@ -0,0 +1,238 @@
+import contextlib
+import functools
+import io
+import threading
+import time
+import timeit
+from typing import Any, Callable, ParamSpecArgs, ParamSpecKwargs
+
+
+def fmt_f_call(f: Callable, *args, **kwargs) -> str:
+    args_s = ", ".join([str(arg) for arg in args])
+    kwargs_s = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
+
+    return f"{f.__name__}({args_s if args else ''}"\
+        f"{', ' if (args and kwargs) else '' }{kwargs_s if kwargs else ''})"
+
+
+def fmt_f_return(f: Callable, return_value: Any, *args, **kwargs) -> str:
+    return f"{fmt_f_call(f, *args, **kwargs)} returned `{return_value}`"
+
+
+# values keep their top `PRECISION_BITS` bits,
+# so a bucket is at most 1 / 2 ** (PRECISION_BITS - 1) = 1.6% wide
+PRECISION_BITS = 7
+
+
+class LatencyHistogram:
+    """A log-bucketed histogram of latencies in nanoseconds like HdrHistogram.
+
+    Each thread records into its own shard (a dict from bucket to count),
+    so recording takes no lock.
+    Shards are merged when the histogram is read.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: list[dict[int, int]] = []
+        self._shards_lock = threading.Lock()
+
+    def _new_shard(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        self._local.counts = counts
+        with self._shards_lock:
+            self._shards.append(counts)
+
+        return counts
+
+    def record(self, ns: int) -> None:
+        try:
+            counts = self._local.counts
+        except AttributeError:
+            counts = self._new_shard()
+
+        # round down to the lower bound of the bucket
+        shift = ns.bit_length() - PRECISION_BITS
+        if shift > 0:
+            ns = ns >> shift << shift
+        counts[ns] = counts.get(ns, 0) + 1
+
+    def counts(self) -> dict[int, int]:
+        "merged counts by the lower bound of buckets"
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        merged: dict[int, int] = {}
+        for shard in shards:
+            # `dict.copy()` is atomic, while iterating a shard is not
+            for bucket, count in shard.copy().items():
+                merged[bucket] = merged.get(bucket, 0) + count
+
+        return merged
+
+    def percentiles(self, *ps: float) -> tuple[int, list[float]]:
+        """Return the number of recorded values and their percentiles.
+
+        Args:
+            ps (tuple[float]): percentiles to compute, e.g. `50, 99, 99.9`
+
+        Returns:
+            tuple[int, list[float]]: the count and the percentiles
+            as the midpoints of the buckets
+        """
+        counts = sorted(self.counts().items())
+        total = sum(count for _, count in counts)
+
+        res = []
+        for p in ps:
+            rank = p / 100 * total
+            seen = 0
+            value = 0.0
+            for bucket, count in counts:
+                seen += count
+                if seen >= rank:
+                    width = 1 << max(0, bucket.bit_length() - PRECISION_BITS)
+                    value = bucket + (width - 1) / 2
+                    break
+            res.append(value)
+
+        return total, res
+
+
+class Latencies:
+    "latency histograms by function"
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def histogram(self, f: Callable) -> LatencyHistogram:
+        return self.histograms.setdefault(
+            f"{f.__module__}.{f.__qualname__}", LatencyHistogram())
+
+    def report(self) -> dict[str, dict[str, float]]:
+        report = {}
+        for name, histogram in self.histograms.items():
+            count, (p50, p99, p999) = histogram.percentiles(50, 99, 99.9)
+            report[name] = {
+                "count": count, "p50": p50, "p99": p99, "p999": p999}
+
+        return report
+
+
+class trace:
+    """Modify the given function `f`
+    to record its latency into `latencies` instead of printing.
+
+    Args:
+        latencies (Latencies): histograms to record latencies
+
+    Returns:
+        Callable: a modified function
+    """
+
+    def __init__(self, latencies: Latencies) -> None:
+        self.latencies = latencies
+
+    def __call__(self, f: Callable) -> Callable:
+        record = self.latencies.histogram(f).record
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs) -> Any:
+            start = perf_counter_ns()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+        return wrapper
+
+
+class print_trace:
+    "`trace` of `trace05.py` printing twice per call"
+
+    def __init__(
+        self,
+        f_call_fmter: Callable[
+            [Callable, ParamSpecArgs, ParamSpecKwargs], str],
+        f_return_fmter:
+        Callable[[Callable, Any, ParamSpecArgs, ParamSpecKwargs], str],
+    ) -> None:
+        self.f_call_fmter = f_call_fmter
+        self.f_return_fmter = f_return_fmter
+
+    def __call__(self, f: Callable) -> Callable:
+        def wrapper(*args, **kwargs) -> Any:
+            print(self.f_call_fmter(f, *args, **kwargs))
+
+            res = f(*args, **kwargs)
+
+            print(self.f_return_fmter(f, res, *args, **kwargs))
+
+            return res
+        return wrapper
+
+
+latencies = Latencies()
+
+
+@trace(latencies)
+def one() -> int:
+    return 1
+
+
+@trace(latencies)
+def eq_name(name1: str, name2: str, case_sensitive: bool = True) -> bool:
+    if case_sensitive:
+        return name1 == name2
+
+    return name1.lower() == name2.lower()
+
+
+def call_many() -> None:
+    for _ in range(10_000):
+        one()
+        eq_name("alice", "Alice", case_sensitive=False)
+
+
+threads = [threading.Thread(target=call_many) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+for name, stats in latencies.report().items():
+    print(name, stats)
+# __main__.one {'count': 40000, 'p50': 269.5, 'p99': 357.5, 'p999': 1031.5}
+# __main__.eq_name {'count': 40000, 'p50': 595.5, 'p99': 779.5, 'p999': 2511.5} # noqa: E501
+
+
+# benchmark
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+n = 200_000
+
+print(f"{'path':>12} {'ns/call':>8}")
+for name, f in [
+    ("untraced", add),
+    ("print", print_trace(fmt_f_call, fmt_f_return)(add)),
+    ("histogram", trace(Latencies())(add)),
+]:
+    # discard printed lines not to measure the terminal
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = timeit.timeit(lambda: f(1, 2), number=n)
+    print(f"{name:>12} {elapsed / n * 1e9:8.0f}")
+
+"""
+Python 3.11.7, 1 CPU, `add(1, 2)` traced
+
+        path  ns/call
+    untraced      107
+       print     5581
+   histogram      897
+
+Recording a latency costs two clock reads, a few bit operations
+and a dict update on the thread's own shard; no string is built.
+Percentiles are within 1.6% of the exact values with 7 precision bits.
+"""
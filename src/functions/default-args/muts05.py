@@ -0,0 +1,178 @@
+import random
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from enum import Enum
+
+
+class Permission(Enum):
+    READ = "read"
+    WRITE = "write"
+    EXECUTE = "execute"
+
+
+# a bit for each member, looked up by the member or its value
+PERMISSION_BITS: dict[Permission | str, int] = {}
+for i, p in enumerate(Permission):
+    PERMISSION_BITS[p] = PERMISSION_BITS[p.value] = 1 << i
+
+
+class PermissionSet:
+    """An immutable set of `Permission`s as a bitmask.
+
+    Sets are interned; all equal sets are the same object,
+    so users sharing a combination of permissions share one object.
+    Adding a permission returns another (interned) set
+    instead of modifying the set, that is, copy-on-write.
+    """
+    __slots__ = ("mask",)
+    mask: int
+
+    _interned: dict[int, "PermissionSet"] = {}
+
+    def __new__(
+        cls, permissions: Iterable[Permission | str] = (),
+    ) -> "PermissionSet":
+        mask = 0
+        for permission in permissions:
+            mask |= PERMISSION_BITS[permission]
+
+        return cls.from_mask(mask)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "PermissionSet":
+        permissions = cls._interned.get(mask)
+        if permissions is None:
+            permissions = object.__new__(cls)
+            object.__setattr__(permissions, "mask", mask)
+            permissions = cls._interned.setdefault(mask, permissions)
+
+        return permissions
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__.from_mask, (self.mask,))
+
+    def __contains__(self, permission: Permission | str) -> bool:
+        # unknown permissions are not in any set, as for a list
+        return bool(self.mask & PERMISSION_BITS.get(permission, 0))
+
+    def __or__(self, permission: Permission | str) -> "PermissionSet":
+        return self.from_mask(self.mask | PERMISSION_BITS[permission])
+
+    def __iter__(self) -> Iterator[Permission]:
+        return (p for p in Permission if self.mask & PERMISSION_BITS[p])
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({[p.value for p in self]})"
+
+
+class User:
+    def __init__(
+        self, id: int,
+        name: str,
+        permissions: Iterable[Permission | str] | None = None
+    ) -> None:
+        self.id = id
+        self.name = name
+        # no copy is needed since `PermissionSet` is immutable
+        self.permissions = permissions \
+            if isinstance(permissions, PermissionSet) \
+            else PermissionSet(permissions or ())
+
+    def add_permission(self, permission: Permission | str) -> None:
+        self.permissions = self.permissions | permission
+
+
+alice = User(0, "alice", ["read"])
+print(alice.permissions)    # PermissionSet(['read'])
+
+bob = User(1, "bob", alice.permissions)
+
+bob.add_permission("write")
+
+print(bob.permissions)  # PermissionSet(['read', 'write'])
+print(alice.permissions)    # PermissionSet(['read'])
+
+# `bob.permissions` was replaced, not modified
+print(bob.permissions is alice.permissions)  # False
+
+# users with the same permissions share one object
+eve = User(2, "eve", [Permission.WRITE, Permission.READ])
+print(eve.permissions is bob.permissions)   # True
+
+# membership check is a bit test
+print("write" in eve.permissions)   # True
+print(Permission.EXECUTE in eve.permissions)    # False
+print("admin" in eve.permissions)   # False
+
+# in hot loops, test the bit directly to skip the method call
+EXECUTE = PERMISSION_BITS[Permission.EXECUTE]
+print(bool(eve.permissions.mask & EXECUTE))  # False
+
+
+# benchmark
+class ListUser:
+    "`User` of `muts04.py`"
+
+    def __init__(
+        self, id: int,
+        name: str,
+        permissions: list[str] | None = None
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.permissions = list(permissions) if permissions else []
+
+    def add_permission(self, permission: str) -> None:
+        self.permissions.append(permission)
+
+
+n = 1_000_000
+random.seed(0)
+values = [p.value for p in Permission]
+combinations = [random.sample(values, random.randint(1, 3)) for _ in range(n)]
+
+print(f"{'permissions':>14} {'B/user':>7} {'users/s':>10}"
+      f" {'`in`/s':>12} {'`mask &`/s':>12}")
+for name, cls in [("list", ListUser), ("PermissionSet", User)]:
+    start = time.perf_counter()
+    users = [cls(i, "user", ps) for i, ps in enumerate(combinations)]
+    elapsed = time.perf_counter() - start
+
+    # memory of distinct permission objects per user
+    distinct = {id(user.permissions): user.permissions for user in users}
+    size = sum(sys.getsizeof(ps) for ps in distinct.values()) / n
+
+    start = time.perf_counter()
+    for user in users:
+        "execute" in user.permissions
+    in_rate = f"{n / (time.perf_counter() - start):12,.0f}"
+
+    mask_rate = f"{'-':>12}"
+    if cls is User:
+        start = time.perf_counter()
+        for user in users:
+            user.permissions.mask & EXECUTE
+        mask_rate = f"{n / (time.perf_counter() - start):12,.0f}"
+
+    print(f"{name:>14} {size:7.1f} {n / elapsed:10,.0f} {in_rate} {mask_rate}")
+    del users
+
+"""
+Python 3.11.7, 1 CPU, 1000000 users with random 1-3 permissions
+
+   permissions  B/user    users/s       `in`/s   `mask &`/s
+          list    77.3    536,459   10,131,765            -
+ PermissionSet     0.0    546,483    3,695,109   10,420,670
+
+B/user is the memory of distinct permission objects per user;
+7 interned sets are shared by 1000000 users (~0.0004 B/user).
+`in` on a short list runs in C, so it beats `PermissionSet.__contains__()`
+that costs a Python method call; testing `mask` directly is the fastest.
+"""
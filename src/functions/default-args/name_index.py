@@ -0,0 +1,144 @@
+import random
+import time
+import unicodedata
+from collections.abc import Callable, Iterable
+
+
+def eq_name(name1: str, name2: str, case_sensitive: bool = True) -> bool:
+    "`eq_name()` of `example.py`"
+    if case_sensitive:
+        return name1 == name2
+
+    return name1.lower() == name2.lower()
+
+
+def caseless(name: str) -> str:
+    """A key to compare names ignoring cases, as the Unicode standard defines.
+
+    `casefold()` maps "ß" to "ss" which `lower()` leaves,
+    and NFD makes a composed character ("ë") and its decomposed form
+    ("e" + U+0308 COMBINING DIAERESIS) equal.
+    """
+    return unicodedata.normalize(
+        "NFD", unicodedata.normalize("NFD", name).casefold())
+
+
+class NameIndex:
+    """A roster of names indexed by case-insensitive keys.
+
+    Keys are computed once per name when the index is built,
+    so a match costs a key of the query and a dict lookup
+    instead of comparing the query with every name.
+
+    Args:
+        names (Iterable[str]): the roster
+        key (Callable[[str], str]): `caseless` by default;
+            `str.casefold` is faster but doesn't normalize characters
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        key: Callable[[str], str] = caseless,
+    ) -> None:
+        self.names = list(names)
+        self.key = key
+        # key -> positions of the names in the roster
+        self.index: dict[str, list[int]] = {}
+        for i, k in enumerate(map(key, self.names)):
+            positions = self.index.get(k)
+            if positions is None:
+                self.index[k] = [i]
+            else:
+                positions.append(i)
+
+    def __contains__(self, name: str) -> bool:
+        return self.key(name) in self.index
+
+    def positions(self, name: str) -> tuple[int, ...]:
+        "positions of the names which match `name` in the roster"
+        # a copy; appending to the list of the index would corrupt it
+        return tuple(self.index.get(self.key(name), ()))
+
+    def match(self, name: str) -> list[str]:
+        "names which match `name`; one-to-many"
+        return [self.names[i] for i in self.positions(name)]
+
+    def match_many(self, names: Iterable[str]) -> dict[str, list[str]]:
+        "names which match each of `names`; many-to-many"
+        names = list(names)
+        get, roster = self.index.get, self.names
+        return {
+            name: [roster[i] for i in get(k, ())]
+            for name, k in zip(names, map(self.key, names))
+        }
+
+
+roster = NameIndex(["alice", "Alice", "bob", "Straße", "Zoë"])
+
+print(roster.match("ALICE"))    # ['alice', 'Alice']
+print(roster.positions("ALICE"))    # (0, 1)
+print("Bob" in roster)  # True
+
+# `lower()` leaves "ß", so `eq_name()` misses it
+print(eq_name("STRASSE", "Straße", case_sensitive=False))   # False
+print(roster.match("STRASSE"))  # ['Straße']
+
+# "e" + combining diaeresis
+print(roster.match("ZOË"))  # ['Zoë']
+
+print(roster.match_many(["bob", "eve"]))
+# {'bob': ['bob'], 'eve': []}
+
+
+# benchmark
+def match_by_eq_name(roster: list[str], queries: list[str]) -> dict:
+    return {
+        query: [name for name in roster
+                if eq_name(query, name, case_sensitive=False)]
+        for query in queries
+    }
+
+
+random.seed(0)
+print(f"{'roster':>8} {'eq_name':>10} {'build':>10} {'match_many':>10}"
+      f" {'casefold':>10}  (ms; 100 queries)")
+for n in [1_000, 10_000, 100_000]:
+    names = [f"user{i}" for i in range(n)]
+    queries = [name.upper() for name in random.sample(names, 100)]
+
+    start = time.perf_counter()
+    expected = match_by_eq_name(names, queries)
+    by_eq_name = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert index.match_many(queries) == expected
+    match_many = time.perf_counter() - start
+
+    # without normalization
+    casefold_index = NameIndex(names, key=str.casefold)
+    start = time.perf_counter()
+    casefold_index.match_many(queries)
+    casefold = time.perf_counter() - start
+
+    print(f"{n:>8} {by_eq_name * 1e3:10.1f} {build * 1e3:10.1f}"
+          f" {match_many * 1e3:10.3f} {casefold * 1e3:10.3f}")
+
+"""
+Python 3.11.7, 1 CPU, 100 queries in upper cases
+
+  roster    eq_name      build match_many   casefold  (ms; 100 queries)
+    1000       17.6        1.4      0.132      0.082
+   10000      178.9        7.4      0.156      0.103
+  100000     1840.2       92.2      0.192      0.236
+
+`eq_name()` is called for every pair of a query and a name
+and allocates two lowered strings per call; O(queries * roster).
+The index computes the keys of the roster once (build),
+then a query costs a key and a dict lookup regardless of the roster size.
+`str.casefold` keys skip normalization; both are tiny next to the build.
+"""
@@ -0,0 +1,231 @@
+import time
+from collections import ChainMap
+from collections.abc import Callable, Mapping
+from itertools import chain
+from typing import Any, Literal
+
+Reducer = Callable[[Any, Any], Any]
+
+
+def merge_dict(a: dict, b: dict, *args) -> dict:
+    "`merge_dict()` of `src/functions/args.py`"
+    res = a | b
+    for arg in args:
+        res |= arg
+
+    return res
+
+
+def merge_dicts(
+    *dicts: Mapping,
+    policy: Literal["last", "first"] | Reducer = "last",
+    deep: bool = False,
+) -> dict:
+    """Merge dicts into a new dict.
+
+    Keys are ordered by their first appearance as `|=` does.
+    Python code runs only for keys in several dicts with a reducer;
+    otherwise, dicts are merged by `dict.update()` in C.
+
+    Args:
+        dicts (tuple[Mapping]): dicts to merge
+        policy (Literal["last", "first"] | Reducer): for keys in several dicts,
+            "last" takes the value of the last dict (same as `|=`),
+            "first" takes the value of the first dict,
+            and a function `f(old, new)` combines the values from left to right
+        deep (bool): merges values of the same key recursively if both are
+            dicts; nested dicts in only one of the dicts are not copied
+
+    Returns:
+        dict: the merged dict
+    """
+    if deep or callable(policy):
+        return _reduce(dicts, _reducer(policy, deep))
+
+    if policy == "last":
+        res = {}
+        for d in dicts:
+            res.update(d)
+        return res
+
+    if policy != "first":
+        raise ValueError(f"unknown policy: {policy!r}")
+
+    # all keys in order first; then updating existing keys doesn't reorder
+    res = dict.fromkeys(chain.from_iterable(dicts))
+    for d in reversed(dicts):
+        res.update(d)
+
+    return res
+
+
+def _reducer(
+    policy: Literal["last", "first"] | Reducer,
+    deep: bool,
+) -> Reducer:
+    if policy == "last":
+        def reducer(old: Any, new: Any) -> Any:
+            return new
+    elif policy == "first":
+        def reducer(old: Any, new: Any) -> Any:
+            return old
+    elif callable(policy):
+        reducer = policy
+    else:
+        raise ValueError(f"unknown policy: {policy!r}")
+
+    if not deep:
+        return reducer
+
+    def deep_reducer(old: Any, new: Any) -> Any:
+        if isinstance(old, Mapping) and isinstance(new, Mapping):
+            return _reduce((old, new), deep_reducer)
+        return reducer(old, new)
+
+    return deep_reducer
+
+
+def _reduce(dicts: tuple[Mapping, ...], reducer: Reducer) -> dict:
+    res: dict = {}
+    for d in dicts:
+        # Python code runs only for keys in both
+        common = res.keys() & d.keys()
+        olds = {k: res[k] for k in common}
+        res.update(d)
+        for k in common:
+            res[k] = reducer(olds[k], d[k])
+
+    return res
+
+
+def merged_view(
+    *dicts: Mapping,
+    policy: Literal["last", "first"] = "last",
+) -> ChainMap:
+    """A view of the merge of dicts without building it.
+
+    A lookup searches the dicts in order of the policy;
+    it costs O(len(dicts)) at worst instead of building the merge.
+    Writes go to an empty dict in front of the dicts, not to the dicts.
+    """
+    if policy not in ("last", "first"):
+        raise ValueError(f"views support only 'last' and 'first': {policy!r}")
+
+    maps = reversed(dicts) if policy == "last" else dicts
+    return ChainMap({}, *maps)
+
+
+def union(old: Any, new: Any) -> Any:
+    "list items of `old` then new items of `new`; `new` for other values"
+    if isinstance(old, list) and isinstance(new, list):
+        return old + [x for x in new if x not in old]
+    return new
+
+
+d1 = {
+    "id": 0,
+    "name": "alice",
+}
+
+d2 = {
+    "active": True,
+}
+
+d3 = {
+    "type": "admin"
+}
+
+d4 = {
+    "permissions": ["read", "write"]
+}
+
+d = merge_dicts(d1, d2, d3, d4)
+print(d == merge_dict(d1, d2, d3, d4))  # True
+
+# layers of configuration; defaults, then a profile, then a request
+defaults = {
+    "type": "user", "permissions": ["read"], "theme": {"color": "light"}}
+profile = {
+    "type": "admin", "permissions": ["write"], "theme": {"font": "mono"}}
+request = {"theme": {"color": "dark"}}
+
+print(merge_dicts(defaults, profile, request))
+# {'type': 'admin', 'permissions': ['write'], 'theme': {'color': 'dark'}}
+
+print(merge_dicts(defaults, profile, request, policy="first"))
+# {'type': 'user', 'permissions': ['read'], 'theme': {'color': 'light'}}
+
+print(merge_dicts(defaults, profile, request, policy=union, deep=True))
+# {
+#   'type': 'admin',
+#   'permissions': ['read', 'write'],
+#   'theme': {'color': 'dark', 'font': 'mono'},
+# }
+
+view = merged_view(defaults, profile, request)
+print(view["type"])  # admin
+view["type"] = "guest"
+print(view["type"], profile["type"])    # guest admin
+
+
+# benchmark
+def make_dicts(count: int, size: int) -> list[dict]:
+    "dicts whose keys overlap by a half with the previous dict"
+    return [
+        {f"key{j}": i for j in range(i * size // 2, i * size // 2 + size)}
+        for i in range(count)
+    ]
+
+
+print(f"{'dicts':>6} {'size':>7}"
+      f" {'|= loop':>8} {'last':>8} {'first':>8} {'reducer':>8}"
+      f" {'view':>8}  (ms)")
+for count, size in [
+        (2, 100_000), (10, 10_000), (100, 1_000), (500, 1_000), (100, 10_000),
+]:
+    dicts = make_dicts(count, size)
+    row = []
+    for f in [
+        lambda: merge_dict(*dicts),
+        lambda: merge_dicts(*dicts),
+        lambda: merge_dicts(*dicts, policy="first"),
+        lambda: merge_dicts(*dicts, policy=max),
+        lambda: merged_view(*dicts),
+    ]:
+        start = time.perf_counter()
+        f()
+        row.append(f"{(time.perf_counter() - start) * 1e3:8.2f}")
+    assert merge_dicts(*dicts) == merge_dict(*dicts)
+    print(f"{count:>6} {size:>7} {' '.join(row)}")
+
+# lookups of the view; each key is searched for in up to all dicts
+dicts = make_dicts(100, 1_000)
+view, merged = merged_view(*dicts), merge_dicts(*dicts)
+keys = list(merged)
+for name, m in [("dict", merged), ("view", view)]:
+    start = time.perf_counter()
+    for k in keys:
+        m[k]
+    elapsed = time.perf_counter() - start
+    print(f"{name} lookups/s: {len(keys) / elapsed:,.0f}")
+
+"""
+Python 3.11.7, 1 CPU, each dict shares a half of its keys with the previous
+
+ dicts    size  |= loop     last    first  reducer     view  (ms)
+     2  100000    23.30    21.53    43.65    92.47     0.03
+    10   10000     8.28     8.10    14.81    48.10     0.03
+   100    1000     9.19     9.51    14.78    44.63     0.04
+   500    1000    72.77    65.89   106.04   229.78     0.06
+   100   10000   242.29   236.28   448.88  1000.50     0.04
+dict lookups/s: 7,863,726
+view lookups/s: 43,717
+
+`|=` is already `dict.update()` in C; resizing is amortized,
+so "last" is no faster. Inserting all keys first with `dict.fromkeys()`
+to size the dict once was measured slower; it adds a pass over all keys.
+"first" pays that pass to keep keys in order of first appearance,
+and a reducer pays a Python call for each key in several dicts.
+A view costs nothing to build, but a lookup searches up to all 100 dicts;
+it pays off when fewer keys are looked up than a merge would insert.
+"""
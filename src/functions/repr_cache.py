@@ -0,0 +1,214 @@
+import io
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+
+# items rendered and written at once by `write_partial_repr()`
+CHUNK_ITEMS = 1_000
+
+
+def partial_repr(obj: object, *args: str, **kwargs: str) -> str:
+    "`partial_repr()` of `src/functions/kwargs.py`"
+    attr_ss = [f"{k}={v!r}" for k,
+               v in obj.__dict__.items() if k in args and k not in kwargs]
+    additional_ss = [f"{k}={v}" for k, v in kwargs.items()]
+    return f"{obj.__class__.__name__}({', '.join(attr_ss + additional_ss)})"
+
+
+class CachedRepr:
+    """A mixin to cache a fragment rendered by `cached_partial_repr()`.
+
+    The last fragment is cached in the instance with its attribute names
+    and thrown away whenever an attribute is set, so it never gets stale
+    as long as attributes are replaced rather than mutated in place.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.__dict__.pop("_repr", None)
+
+
+def cached_partial_repr(obj: object, *args: str) -> str:
+    """Same as `partial_repr(obj, *args)`, cached for `CachedRepr` objects.
+
+    Args:
+        obj (object): object to represent
+        args (tuple[str]): attribute names to represent
+
+    Returns:
+        str: representation of `obj`
+    """
+    cached = obj.__dict__.get("_repr")
+    if cached is not None and cached[0] == args:
+        return cached[1]
+
+    s = partial_repr(obj, *args)
+    if isinstance(obj, CachedRepr):
+        # not by `setattr()`, which would clear the cache
+        obj.__dict__["_repr"] = (args, s)
+    return s
+
+
+def write_partial_repr(
+    write: Callable[[str], Any],
+    obj: object,
+    *args: str,
+    items: str,
+    item_args: tuple[str, ...] = (),
+    limit: int | None = None,
+) -> None:
+    """Write the representation of `obj` with its items piece by piece.
+
+    For example, `UserGroup(id=0, name='developers', users=[User(id=0,
+    name='alice'), ..., 99990 more])`, where each user is rendered by
+    `cached_partial_repr()`. Only fragments of `CHUNK_ITEMS` items
+    are built at a time instead of the whole string.
+
+    Args:
+        write (Callable[[str], Any]): e.g. `write()` of a file
+        obj (object): object to represent
+        args (tuple[str]): attribute names of `obj` to represent
+        items (str): the attribute name of a list of objects to represent
+        item_args (tuple[str]): attribute names of the items to represent
+        limit (int | None): the max number of items to represent
+    """
+    head = cached_partial_repr(obj, *args)
+    write(head[:-1])
+    write(", " if head[-2] != "(" else "")
+    write(f"{items}=[")
+
+    seq = getattr(obj, items)
+    it = islice(seq, limit)
+    sep = ""
+    # fragments of a chunk of items are joined to save calls of `write()`
+    while chunk := list(islice(it, CHUNK_ITEMS)):
+        write(sep)
+        write(", ".join(
+            [cached_partial_repr(item, *item_args) for item in chunk]))
+        sep = ", "
+
+    rest = len(seq) - (len(seq) if limit is None else min(limit, len(seq)))
+    if rest:
+        # no separator before the ellipsis if no item is written
+        write(f"{sep}..., {rest} more")
+    write("])")
+
+
+class User(CachedRepr):
+    def __init__(self, id: int, name: str, active: bool, type: str) -> None:
+        self.id = id
+        self.name = name
+        self.active = active
+        self.type = type
+        self.created_at = datetime.now()
+
+
+class UserGroup(CachedRepr):
+    def __init__(self, id: int, name: str, users: list[User]) -> None:
+        self.id = id
+        self.name = name
+        self.users = list(users)
+        self.created_at = datetime.now()
+
+
+alice = User(0, "alice", True, "admin")
+bob = User(1, "bob", False, "user")
+eve = User(2, "eve", True, "user")
+
+users = [alice, bob, eve]
+
+user_group = UserGroup(0, "developers", users)
+
+print(cached_partial_repr(alice, "id", "name"))  # User(id=0, name='alice')
+
+alice.name = "alicia"
+print(cached_partial_repr(alice, "id", "name"))  # User(id=0, name='alicia')
+
+out = io.StringIO()
+write_partial_repr(out.write, user_group, "id", "name",
+                   items="users", item_args=("id", "name"), limit=2)
+print(out.getvalue())
+# UserGroup(id=0, name='developers', users=[User(id=0, name='alicia'), User(id=1, name='bob'), ..., 1 more])  # noqa: E501
+
+out = io.StringIO()
+write_partial_repr(out.write, user_group, "id", "name",
+                   items="users", item_args=("id", "name"), limit=0)
+print(out.getvalue())
+# UserGroup(id=0, name='developers', users=[..., 3 more])
+
+
+# benchmark
+n = 100_000
+group = UserGroup(0, "developers",
+                  [User(i, f"user{i}", True, "user") for i in range(n)])
+
+
+def repr_by_kwargs() -> str:
+    "as `src/functions/kwargs.py` does"
+    users_repr = \
+        f"{[partial_repr(user, 'id', 'name') for user in group.users]}"
+    return partial_repr(group, "id", "name", users=users_repr)
+
+
+def write_all(write: Callable[[str], Any]) -> None:
+    write_partial_repr(write, group, "id", "name",
+                       items="users", item_args=("id", "name"))
+
+
+def write_first_10(write: Callable[[str], Any]) -> None:
+    write_partial_repr(write, group, "id", "name",
+                       items="users", item_args=("id", "name"), limit=10)
+
+
+def clear_caches() -> None:
+    for user in group.users:
+        user.__dict__.pop("_repr", None)
+
+
+def change_a_user() -> None:
+    group.users[n // 2].name = "changed"
+
+
+devnull = open(os.devnull, "w")
+print(f"{'':>26} {'ms':>8} {'peak MB':>8}")
+for name, f, prepare in [
+    ("partial_repr() in a list", repr_by_kwargs, None),
+    ("write (cold cache)", lambda: write_all(devnull.write), clear_caches),
+    ("write (warm cache)", lambda: write_all(devnull.write), None),
+    ("write (1 user changed)", lambda: write_all(devnull.write),
+     change_a_user),
+    ("write first 10", lambda: write_first_10(devnull.write), None),
+]:
+    prepare and prepare()
+    start = time.perf_counter()
+    f()
+    elapsed = time.perf_counter() - start
+    prepare and prepare()
+    tracemalloc.start()
+    f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>26} {elapsed * 1e3:8.1f} {peak / 1e6:8.1f}")
+devnull.close()
+
+"""
+Python 3.11.7, 1 CPU, a group of 100000 users
+
+                                 ms  peak MB
+  partial_repr() in a list    211.1     14.3
+        write (cold cache)    357.2     19.2
+        write (warm cache)     71.7      0.1
+    write (1 user changed)     51.4      0.1
+            write first 10      0.0      0.0
+
+Peak MB of `write` is the chunk of 1000 fragments, except for the cold cache
+where it is the cached fragments kept in users.
+The cold cache is slower since a new key in `__dict__` of every user
+costs more than rendering; it pays off from the second rendering,
+after which only changed users are rendered again.
+"""
@@ -0,0 +1,229 @@
+import mmap
+import os
+import random
+import struct
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice, starmap
+from operator import itemgetter
+from typing import Any
+
+# records read at once by iteration
+CHUNK_RECORDS = 1 << 16
+
+# steps up to this read whole spans; larger steps read each record
+DENSE_STEP = 8
+
+# formats which `memoryview.cast()` supports
+NATIVE_FORMATS = frozenset("bBhHiIlLqQfd")
+
+
+class RecordFile(Sequence):
+    """A file of fixed-width records as a read-only sequence.
+
+    The file is memory-mapped, so the OS reads pages only when
+    records in them are accessed, and the file can be larger than RAM.
+    Subscripting works as lists do, including negative indices,
+    but a slice is another `RecordFile` over the same mapping
+    instead of a list; `list(a[::-1])` copies records explicitly.
+
+    Args:
+        path (str): a file written by `RecordFile.write()`
+        fmt (str): a `struct` format of a record, e.g. "q" or "<qd"
+    """
+
+    def __init__(self, path: str, fmt: str = "q") -> None:
+        self.struct = struct.Struct(fmt)
+        self.mm: mmap.mmap | None = None
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            n, rest = divmod(size, self.struct.size)
+            if rest:
+                raise ValueError(
+                    f"the size of {path} is not a multiple of"
+                    f" {self.struct.size}")
+            # an empty file cannot be mapped; no record is ever read
+            if size:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.indices = range(n)
+
+    @classmethod
+    def write(cls, path: str, records: Iterable, fmt: str = "q") -> None:
+        "records are tuples, or values if `fmt` has one field"
+        s = struct.Struct(fmt)
+        single = _num_fields(s) == 1
+        with open(path, "wb") as f:
+            it = iter(records)
+            while chunk := list(islice(it, CHUNK_RECORDS)):
+                packed = map(s.pack, chunk) if single \
+                    else starmap(s.pack, chunk)
+                f.write(b"".join(packed))
+
+    def _view(self, indices: range) -> "RecordFile":
+        view = object.__new__(RecordFile)
+        view.struct = self.struct
+        view.mm = self.mm
+        view.indices = indices
+        return view
+
+    def _unpack(self, record: tuple) -> Any:
+        return record[0] if len(record) == 1 else record
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return self._view(self.indices[i])
+        # `range` handles negative indices and raises IndexError
+        offset = self.indices[i] * self.struct.size
+        return self._unpack(self.struct.unpack_from(self.mm, offset))
+
+    def __iter__(self) -> Iterator:
+        r, size = self.indices, self.struct.size
+        if abs(r.step) > DENSE_STEP:
+            # sparse; only pages of the records are read
+            unpack_from, mm = self.struct.unpack_from, self.mm
+            return map(self._unpack,
+                       (unpack_from(mm, i * size) for i in r))
+        return chain.from_iterable(map(self._read_span, (
+            r[i:i + CHUNK_RECORDS] for i in range(0, len(r), CHUNK_RECORDS))))
+
+    def _read_span(self, r: range) -> Sequence:
+        "records of `r` from one read of the span from `min(r)` to `max(r)`"
+        size = self.struct.size
+        lo, hi = (r[0], r[-1]) if r.step > 0 else (r[-1], r[0])
+        data = self.mm[lo * size:(hi + 1) * size]
+        fmt = self.struct.format
+        if fmt in NATIVE_FORMATS:
+            # values without tuples
+            return memoryview(data).cast(fmt)[::r.step]
+        records = list(self.struct.iter_unpack(data))[::r.step]
+        if _num_fields(self.struct) == 1:
+            return list(map(itemgetter(0), records))
+        return records
+
+    def __reversed__(self) -> Iterator:
+        return iter(self[::-1])
+
+    def close(self) -> None:
+        "closes the mapping shared with all slices"
+        if self.mm is not None:
+            self.mm.close()
+
+    def __enter__(self) -> "RecordFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        r = self.indices
+        return f"{self.__class__.__name__}" \
+            f"({self.struct.format!r}, [{r.start}:{r.stop}:{r.step}])"
+
+
+def _num_fields(s: struct.Struct) -> int:
+    return len(s.unpack(bytes(s.size)))
+
+
+tmpdir = tempfile.mkdtemp()
+path = os.path.join(tmpdir, "a.bin")
+RecordFile.write(path, range(10))
+
+with RecordFile(path) as a:
+    print(a[0])  # 0
+    print(a[-1])     # 9
+    print(a[-2])     # 8
+    print(list(a[1:8:2]))    # [1, 3, 5, 7]
+    print(list(a[-2:]))  # [8, 9]
+    print(list(a[::-1]))     # [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    print(a[::-1])  # RecordFile('q', [9:-1:-1])
+    print(a[::-1][:3][-1])  # 7
+    # a[10]  # IndexError: range object index out of range
+
+# records of several fields
+points = os.path.join(tmpdir, "points.bin")
+RecordFile.write(points, [(1, 0.5), (2, 1.5)], fmt="<qd")
+with RecordFile(points, fmt="<qd") as p:
+    print(p[-1])    # (2, 1.5)
+
+# an empty file is an empty sequence
+RecordFile.write(path, [])
+with RecordFile(path) as a:
+    print(len(a), list(a), list(a[::-1]))  # 0 [] []
+
+
+# benchmark
+n = 10_000_000
+RecordFile.write(path, range(n))
+print(f"{'':>22} {'seconds':>8} {'peak MB':>8}")
+
+
+def bench(name: str, f: Any) -> Any:
+    start = time.perf_counter()
+    res = f()
+    elapsed = time.perf_counter() - start
+    del res
+    tracemalloc.start()
+    res = f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>22} {elapsed:8.3f} {peak / 1e6:8.1f}")
+    return res
+
+
+def load() -> list[int]:
+    with open(path, "rb") as f:
+        return [x for (x,) in struct.iter_unpack("q", f.read())]
+
+
+random.seed(0)
+positions = [random.randrange(-n, n) for _ in range(1_000_000)]
+
+a = bench("open RecordFile", lambda: RecordFile(path))
+bench("1M random a[i]", lambda: [a[i] for i in positions])
+bench("sum(a)", lambda: sum(a))
+bench("sum(a[::-1])", lambda: sum(a[::-1]))
+bench("sum(a[::100])", lambda: sum(a[::100]))
+a.close()
+
+
+def bench_list() -> None:
+    lst = bench("load a list", load)
+    bench("1M random lst[i]", lambda: [lst[i] for i in positions])
+    bench("sum(lst)", lambda: sum(lst))
+    bench("sum(lst[::-1])", lambda: sum(lst[::-1]))
+    bench("sum(lst[::100])", lambda: sum(lst[::100]))
+
+
+bench_list()
+os.remove(path)
+os.remove(points)
+os.rmdir(tmpdir)
+
+"""
+Python 3.11.7, 1 CPU, 10000000 int64 records (80 MB), the file in page cache
+
+                        seconds  peak MB
+       open RecordFile    0.000      0.0
+        1M random a[i]    0.711     40.4
+                sum(a)    0.285      0.5
+          sum(a[::-1])    0.277      0.5
+         sum(a[::100])    0.055      0.0
+           load a list    0.984    489.1
+      1M random lst[i]    0.634      8.4
+              sum(lst)    0.083      0.0
+        sum(lst[::-1])    0.187     80.0
+       sum(lst[::100])    0.006      0.8
+
+Opening a `RecordFile` maps the file without reading it,
+while loading it into a list takes a second and 489 MB (int objects).
+A random `a[i]` unpacks a record, ~10% slower than `lst[i]`.
+A scan, reversed or not, reads 65536 records at once with 0.5 MB;
+it is 3x slower than summing a loaded list but faster than loading it.
+`a[::100]` reads only the records of the slice one by one.
+Peak MB of random access is the list of results (40 MB for 1M ints).
+"""
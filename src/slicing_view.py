@@ -0,0 +1,167 @@
+import time
+import tracemalloc
+from array import array
+from collections.abc import Iterator, MutableSequence, Sequence
+from typing import Any
+
+
+class SliceView(Sequence):
+    """A slice of a sequence without copying its elements.
+
+    Slicing a view returns another view in O(1);
+    `a[1:8:2]` composes start/stop/step lazily as a `range` of indices,
+    and for buffer types (`bytes`, `bytearray`, `array`) as a `memoryview`.
+    Elements are copied only by `copy()`.
+
+    Like a `memoryview`, a view reflects changes of the elements of the base,
+    but its indices are fixed when it is created,
+    so the base should not be resized while views are in use.
+    """
+    __slots__ = ("base", "indices", "buffer")
+
+    def __init__(self, base: Sequence, indices: range | None = None) -> None:
+        self.base = base
+        self.indices = range(len(base)) if indices is None else indices
+        self.buffer: memoryview | None = None
+        try:
+            # the base can't be resized while the memoryview exists
+            self.buffer = memoryview(base)[_to_slice(self.indices)]
+        except TypeError:
+            # not a buffer, e.g. a list
+            pass
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return SliceView(self.base, self.indices[i])
+        if self.buffer is not None:
+            return self.buffer[i]
+        return self.base[self.indices[i]]
+
+    def __setitem__(self, i: int, value: Any) -> None:
+        if not isinstance(self.base, MutableSequence | bytearray | array):
+            raise TypeError(
+                f"{type(self.base).__name__} object does not support"
+                " item assignment")
+        self.base[self.indices[i]] = value
+
+    def __iter__(self) -> Iterator:
+        if self.buffer is not None:
+            return iter(self.buffer)
+        return map(self.base.__getitem__, self.indices)
+
+    def copy(self) -> Sequence:
+        "elements of the view as the type of the base"
+        if isinstance(self.base, array):
+            copied = array(self.base.typecode)
+            copied.frombytes(self.buffer.tobytes())
+            return copied
+        # slicing the base copies in C
+        return self.base[_to_slice(self.indices)]
+
+    def __repr__(self) -> str:
+        r = self.indices
+        return f"{self.__class__.__name__}({type(self.base).__name__}" \
+            f"[{r.start}:{r.stop}:{r.step}], len={len(self)})"
+
+
+def _to_slice(r: range) -> slice:
+    if not r:
+        # an empty reversed range may start at -1, which means the last
+        return slice(0, 0)
+    # stop of a reversed range to index 0 is -1, which means the last
+    stop = r[-1] + r.step
+    return slice(r.start, stop if stop >= 0 else None, r.step)
+
+
+a = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+view = SliceView(a)
+
+# start=1, stop=8, step=2
+print(view[1:8:2])  # SliceView(list[1:8:2], len=4)
+print(list(view[1:8:2]))    # [1, 3, 5, 7]
+
+# slices of a view are views
+print(list(view[::-1][:3]))  # [9, 8, 7]
+print(view[::-1][:3][0])    # 9
+
+# a view reflects changes of the base
+tail2 = view[-2:]
+a[9] = 100
+print(list(tail2))  # [8, 100]
+
+# copy only when it is needed
+copied = view[1:8:2].copy()
+print(copied)   # [1, 3, 5, 7]
+print(type(copied))  # <class 'list'>
+
+# buffers are sliced by `memoryview`
+b = bytearray(b"0123456789")
+print(bytes(SliceView(b)[::-1][:3]))  # b'987'
+print(SliceView(array("q", range(10)))[1:8:2].copy())
+# array('q', [1, 3, 5, 7])
+
+# slicing past the end gives an empty view, even reversed
+print(bytes(SliceView(b)[::-1][20:]))   # b''
+print(SliceView(a)[::-1][20:].copy())   # []
+
+
+# benchmark
+def chained_slices(a: Sequence) -> Sequence:
+    "slices taken step by step as a program narrows down data"
+    a = a[1:]
+    a = a[::2]
+    a = a[::-1]
+    a = a[: len(a) // 2]
+    return a[0]
+
+
+print(f"{'':>18} {'copy ms':>8} {'copy MB':>8} {'view ms':>8} {'view MB':>8}")
+n = 10_000_000
+for name, data in [
+    ("list", list(range(n))),
+    ("array('q')", array("q", range(n))),
+    ("bytearray", bytearray(n)),
+]:
+    row = []
+    for sliced in [data, SliceView(data)]:
+        start = time.perf_counter()
+        chained_slices(sliced)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        chained_slices(sliced)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        row.append(f"{elapsed * 1e3:8.2f} {peak / 1e6:8.1f}")
+    print(f"{name:>18} {' '.join(row)}")
+
+    # iterating the result; a view pays for indirection per element
+    for sliced in [data[1::2], SliceView(data)[1::2]]:
+        start = time.perf_counter()
+        for _ in sliced:
+            pass
+        row.append(f"{(time.perf_counter() - start) * 1e3:8.1f}")
+    print(f"{'iterate ' + name:>18} {row[2]} {'':>8} {row[3]}")
+    del data
+
+"""
+Python 3.11.7, 1 CPU, 10000000 elements
+
+                    copy ms  copy MB  view ms  view MB
+              list   398.91    120.0     0.12      0.0
+      iterate list    138.1             359.5
+        array('q')   157.40    120.0     0.06      0.0
+iterate array('q')    223.3             207.1
+         bytearray     6.77     15.0     0.04      0.0
+ iterate bytearray    106.4             148.4
+
+Each slice of a list copies the references of its elements;
+4 chained slices of 10000000 elements allocate 120 MB at peak,
+while views allocate only `range`s and `memoryview`s.
+A view pays when it is iterated: elements of a list are looked up
+through the indices, ~2.5x of iterating a copied list.
+Buffers are iterated by `memoryview` at about the speed of a copy.
+Copy a view once with `copy()` if it is iterated many times.
+"""
@@ -0,0 +1,139 @@
+import time
+import tracemalloc
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import repeat
+
+
+class User:
+    "`User` of `src/functions/kwargs.py`; attributes are in `__dict__`"
+
+    def __init__(self, id: int, name: str, active: bool, type: str) -> None:
+        self.id = id
+        self.name = name
+        self.active = active
+        self.type = type
+        self.created_at = datetime.now()
+
+
+class SlottedUser:
+    """`User` whose attributes are in fixed slots instead of `__dict__`.
+
+    Instances have no `__dict__`, which saves the memory of the dict
+    and makes attribute access a little faster,
+    but no attributes other than `__slots__` can be set.
+    """
+    __slots__ = ("id", "name", "active", "type", "created_at")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        active: bool,
+        type: str,
+        created_at: datetime | None = None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.active = active
+        self.type = type
+        self.created_at: datetime \
+            = created_at if created_at is not None else datetime.now()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id}, name={self.name}," \
+            f" active={self.active}, type={self.type})"
+
+    @classmethod
+    def bulk(
+        cls,
+        ids: Iterable[int],
+        names: Iterable[str],
+        actives: Iterable[bool],
+        types: Iterable[str],
+    ) -> list["SlottedUser"]:
+        """Create users from columns in one pass.
+
+        All users share one `created_at` taken once for the batch.
+        """
+        return list(map(cls, ids, names, actives, types,
+                        repeat(datetime.now())))
+
+
+alice = SlottedUser(0, "alice", True, "admin")
+print(alice)    # SlottedUser(id=0, name=alice, active=True, type=admin)
+
+# alice.email = "alice@example.com"
+# AttributeError: 'SlottedUser' object has no attribute 'email'
+
+# print(alice.__dict__)
+# AttributeError: 'SlottedUser' object has no attribute '__dict__'
+
+users = SlottedUser.bulk(
+    [1, 2],
+    ["bob", "eve"],
+    [False, True],
+    ["user", "user"],
+)
+print(users)
+# [
+#   SlottedUser(id=1, name=bob, active=False, type=user),
+#   SlottedUser(id=2, name=eve, active=True, type=user),
+# ]
+print(users[0].created_at is users[1].created_at)   # True
+
+
+# benchmark
+n = 1_000_000
+ids = list(range(n))
+names = [f"user{i}" for i in range(n)]
+actives = [i % 2 == 0 for i in range(n)]
+types = ["user"] * n
+
+
+def build_dict_users() -> list:
+    return [User(*row) for row in zip(ids, names, actives, types)]
+
+
+def build_slotted_users() -> list:
+    return [SlottedUser(*row) for row in zip(ids, names, actives, types)]
+
+
+def build_slotted_users_in_bulk() -> list:
+    return SlottedUser.bulk(ids, names, actives, types)
+
+
+print(f"{'class':>20} {'B/instance':>10} {'users/s':>10}")
+for name, build in [
+    ("User", build_dict_users),
+    ("SlottedUser", build_slotted_users),
+    ("SlottedUser.bulk()", build_slotted_users_in_bulk),
+]:
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    del built
+
+    # the memory of users and their `created_at`, not of ids or names
+    tracemalloc.start()
+    built = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+
+    print(f"{name:>20} {size / n:10.1f} {n / elapsed:10,.0f}")
+
+"""
+Python 3.11.7, 1 CPU, 1000000 users
+
+               class B/instance    users/s
+                User      160.4    418,877
+         SlottedUser      120.4    552,476
+  SlottedUser.bulk()       80.4    917,179
+
+B/instance includes the list slot (8 bytes) and `created_at`.
+`__slots__` saves the per-instance dict (~40 bytes here;
+Python 3.11 already shares dict keys between instances).
+`bulk()` shares one `datetime` (48 bytes) among all users
+and calls `datetime.now()` once instead of per user.
+"""